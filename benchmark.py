@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Render benchmark - drives DisplayManager.render() for every screen on
+luma's dummy device, no hardware needed
+
+Usage:
+    python3 benchmark.py                          # all engines, save results
+    python3 benchmark.py --frames 500 --engine numpy
+    python3 benchmark.py --compare benchmark_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from luma.core.device import dummy
+
+from display import DisplayManager
+from menu_manager import TabManager
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# name -> DisplayManager options
+ENGINES = {
+    "pil": {"retained": False, "engine": "pil"},
+    "retained": {"retained": True, "engine": "pil"},
+    "numpy": {"retained": False, "engine": "numpy"},
+}
+
+# name -> (active tab, settings mode, alarm ringing)
+SCENARIOS = {
+    "home": ("home", "view", False),
+    "system": ("system", "view", False),
+    "weather": ("weather", "view", False),
+    "network": ("network", "view", False),
+    "power": ("power", "view", False),
+    "timer": ("timer", "view", False),
+    "settings_view": ("settings", "view", False),
+    "settings_menu": ("settings", "menu", False),
+    "settings_edit": ("settings", "edit", False),
+    "alarm": ("home", "view", True),
+}
+
+
+# ==============================
+# Frame data
+# ==============================
+
+def make_frames(scenario, count, seed=0):
+    """
+    Build a deterministic sequence of frame data for one scenario
+
+    Values drift the way they do on a running device: the clock ticks,
+    stats change every few frames, the signal fluctuates.
+    """
+    tab, mode, alarm = SCENARIOS[scenario]
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, 7, 29, 0)
+    edit_item = TabManager.SETTINGS_ITEMS[1]  # Contrast slider
+
+    stats = {"cpu_temp": 48.0, "memory_usage": 35, "disk_usage": 62,
+             "uptime": "3h 12m", "uptime_hours": 3.2}
+    frames = []
+    for i in range(count):
+        now += timedelta(seconds=1)
+        if i % 3 == 0:
+            stats = dict(stats,
+                         cpu_temp=round(45 + rng.random() * 10, 1),
+                         memory_usage=rng.randint(30, 40))
+        frames.append({
+            "now": now,
+            "stats": stats,
+            "weather": {"updated": True, "city": "Hanoi", "temp": 31, "condition": "Clouds",
+                        "humidity": 74, "wind_speed": 3.1},
+            "ip_status": "192.168.1.20",
+            "signal": {"ssid": "home", "dbm": rng.choice([-48, -52, -55])},
+            "wake_active": alarm,
+            "remaining_time": 10 - (i // 10) % 10,
+            "active_tab": tab,
+            "menu_state": {
+                "mode": mode,
+                "menu_index": (i // 20) % len(TabManager.SETTINGS_ITEMS),
+                "menu_item": edit_item if mode == "edit" else None,
+                "edit_value": (i // 5) % 101,
+            },
+            "brightness": 5,
+            "contrast": 55,
+            "wake_time": "07:30",
+        })
+    return frames
+
+
+# ==============================
+# Measurement
+# ==============================
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def make_display(options):
+    """DisplayManager on a dummy device, frames sent synchronously"""
+    return DisplayManager(device=dummy(width=128, height=64, mode="1"), threaded=False, **options)
+
+
+def time_scenario(display_mgr, frames):
+    """Render frames, returns per-frame times in microseconds and bytes sent"""
+    flusher = display_mgr.framebuffer
+    start_bytes = flusher.total_bytes
+    times = []
+    for data in frames:
+        start = time.perf_counter_ns()
+        display_mgr.render(data)
+        times.append((time.perf_counter_ns() - start) / 1000.0)
+    return times, flusher.total_bytes - start_bytes
+
+
+def measure_allocations(display_mgr, frames):
+    """Average allocated blocks and peak bytes per frame (separate pass, tracemalloc is slow)"""
+    tracemalloc.start()
+    blocks = 0
+    peak_bytes = 0
+    try:
+        for data in frames:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            display_mgr.render(data)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            blocks += sum(max(0, stat.count_diff) for stat in after.compare_to(before, "lineno"))
+            peak_bytes += peak - base
+    finally:
+        tracemalloc.stop()
+    count = len(frames) or 1
+    return blocks / count, peak_bytes / count
+
+
+def run_engine(options, frame_count, alloc_frames, warmup):
+    """Benchmark every scenario with one engine configuration"""
+    display_mgr = make_display(options)
+    results = {}
+    total_frames = 0
+    total_us = 0.0
+
+    for scenario in SCENARIOS:
+        frames = make_frames(scenario, warmup + frame_count + alloc_frames)
+        # Warm caches (text bitmaps, layers) as a long-running device would have
+        for data in frames[:warmup]:
+            display_mgr.render(data)
+
+        times, sent = time_scenario(display_mgr, frames[warmup:warmup + frame_count])
+        blocks, peak = measure_allocations(display_mgr, frames[warmup + frame_count:])
+
+        elapsed = sum(times)
+        total_frames += len(times)
+        total_us += elapsed
+        results[scenario] = {
+            "frames": len(times),
+            "fps": round(len(times) / (elapsed / 1e6), 1) if elapsed else 0.0,
+            "p50_us": round(percentile(times, 50), 1),
+            "p90_us": round(percentile(times, 90), 1),
+            "p99_us": round(percentile(times, 99), 1),
+            "max_us": round(max(times), 1) if times else 0.0,
+            "alloc_blocks_per_frame": round(blocks, 1),
+            "alloc_peak_bytes_per_frame": round(peak),
+            "i2c_bytes_per_frame": round(sent / len(times), 1) if times else 0.0,
+        }
+
+    display_mgr.close()
+    return {
+        "engine": display_mgr.engine,
+        "fps": round(total_frames / (total_us / 1e6), 1) if total_us else 0.0,
+        "text_cache": display_mgr.text_cache.get_stats(),
+        "screens": results,
+    }
+
+
+# ==============================
+# Reporting
+# ==============================
+
+def git_revision():
+    """Current commit hash, None outside a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).strip()
+    except Exception:
+        return None
+
+
+def print_report(name, result, baseline=None):
+    """Print one engine's results as a table, with deltas against a baseline run"""
+    print(f"\n== {name} ({result['engine']}) - {result['fps']} fps overall")
+    print(f"{'screen':<15}{'fps':>9}{'p50us':>9}{'p99us':>9}{'blocks':>8}{'peakB':>8}{'i2cB':>8}")
+    for scenario, stats in result["screens"].items():
+        line = (
+            f"{scenario:<15}{stats['fps']:>9}{stats['p50_us']:>9}{stats['p99_us']:>9}"
+            f"{stats['alloc_blocks_per_frame']:>8}{stats['alloc_peak_bytes_per_frame']:>8}"
+            f"{stats['i2c_bytes_per_frame']:>8}"
+        )
+        old = (baseline or {}).get("screens", {}).get(scenario)
+        if old and old["p50_us"]:
+            change = (stats["p50_us"] - old["p50_us"]) / old["p50_us"] * 100
+            line += f"   p50 {change:+.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OLED rendering on a dummy device")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per screen")
+    parser.add_argument("--alloc-frames", type=int, default=30, help="frames traced for allocations")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed frames per screen")
+    parser.add_argument("--engine", choices=sorted(ENGINES), action="append",
+                        help="engine(s) to run (default: all)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        try:
+            with open(args.compare, "r") as f:
+                baseline = json.load(f).get("engines", {})
+        except Exception as e:
+            print(f"Error loading baseline: {e}")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "frames": args.frames,
+        "engines": {},
+    }
+
+    for name in args.engine or list(ENGINES):
+        result = run_engine(ENGINES[name], args.frames, args.alloc_frames, args.warmup)
+        report["engines"][name] = result
+        print_report(name, result, baseline.get(name))
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,82 @@
 """Configuration and constants"""
 
 # File paths
-WAKE_FILE = "/home/biu/wakeup.json"
+WAKE_FILE = "/home/biu/wakeup.json"  # legacy, imported into settings "alarms"
 CERT_FILE = "/home/biu/cert.pem"
 KEY_FILE = "/home/biu/key.pem"
 SETTINGS_FILE = "/home/biu/settings.json"
 
+# Settings persistence (write-behind)
+SETTINGS_SAVE_DELAY = 2.0  # seconds without changes before settings are written
+SETTINGS_SAVE_MAX_DELAY = 10.0  # longest a change waits while changes keep coming
+FILE_WATCH_DEBOUNCE = 0.5  # seconds a settings file must be quiet before it is reloaded
+
 # WiFi settings
 WIFI_TIMEOUT = 60
 WIFI_CHECK_INTERVAL = 5
+WIFI_INTERFACE = "wlan0"
+WIFI_SIGNAL_INTERVAL = 10  # seconds between signal samples in event mode
+
+# System monitor
+CPU_SAMPLE_WINDOW = 10  # samples in the rolling CPU average
+THERMAL_ZONE_FILE = "/sys/class/thermal/thermal_zone0/temp"
+DISK_USAGE_PATH = "/"
+
+# Seconds each metric is served from cache before it is sampled again
+STATS_REFRESH_INTERVALS = {
+    "cpu_temp": 2,
+    "cpu_usage": 1,
+    "memory_usage": 2,
+    "disk_usage": 60,
+    "uptime": 30,
+    "network": 5,
+}
 
 # Display settings
 DISPLAY_I2C_PORT = 1
 DISPLAY_I2C_ADDRESS = 0x3C
 DISPLAY_WIDTH = 128
 DISPLAY_HEIGHT = 64
+FRAMEBUFFER_RANGE_GAP = 8  # unchanged columns worth bridging in one I2C write
+DISPLAY_THREADED = True  # flush frames from a dedicated display thread
+DISPLAY_RETAINED = True  # redraw only widgets whose values changed
+DISPLAY_ENGINE = "pil"  # "pil" or "numpy" (page-ordered buffer, needs numpy)
 
 # Web server
 WEB_SERVER_PORT = 443
 
 # Wake alarm
 WAKE_DURATION = 10  # seconds
-WAKE_CHECK_INTERVAL = 1  # seconds
+WAKE_REARM_INTERVAL = 60  # max seconds the alarm timer sleeps before re-checking the wall clock
 
 # Weather API (using Open-Meteo free API - no key needed)
 WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
-WEATHER_UPDATE_INTERVAL = 600  # Update every 10 minutes
+WEATHER_UPDATE_INTERVAL = 3600  # One hourly/daily forecast fetch per hour
 WEATHER_TIMEOUT = 5
+WEATHER_FORECAST_DAYS = 2  # hourly data from local midnight, so always >= 24h ahead
+WEATHER_INTERPOLATE_INTERVAL = 300  # seconds between local updates of the shown values
+WEATHER_NEXT_HOURS = 3  # hours listed on the weather screen
+WEATHER_CACHE_FILE = "/home/biu/weather_cache.json"
+WEATHER_CACHE_TTL = 10800  # seconds before a cached forecast is shown as stale
+WEATHER_BACKOFF_MIN = 60  # first retry delay after a failed fetch (doubles per failure)
+WEATHER_BACKOFF_MAX = 3600
+LOCATION_CACHE_FILE = "/home/biu/location_cache.json"  # resolved locations by SSID / public IP
+
+# Outbound HTTP (shared keep-alive session, see http_client.py)
+HTTP_USER_AGENT = "oled-weather"
+HTTP_TIMEOUT = 5  # seconds per attempt
+HTTP_POOL_SIZE = 4  # kept-alive connections per host
+HTTP_RETRIES = 2  # extra attempts for connection errors, 429 and 5xx
+HTTP_RETRY_BASE_DELAY = 1.0  # seconds before the first retry (doubles, jittered)
+HTTP_HOST_MIN_INTERVAL = {  # min seconds between requests to a host
+    "nominatim.openstreetmap.org": 1.0,  # usage policy: at most 1 request/s
+    "ipapi.co": 2.0,
+    "default": 0.5
+}
+HTTP_BREAKER_THRESHOLD = 3  # consecutive failures before a host's circuit opens
+HTTP_BREAKER_BASE_DELAY = 30  # first cool-down in seconds (doubles, jittered)
+HTTP_BREAKER_MAX_DELAY = 1800
+HTTP_VALIDATOR_CACHE_SIZE = 32  # ETag/Last-Modified bodies kept for conditional GETs
 
 # Location (default: can be overridden)
 DEFAULT_LATITUDE = 40.7128
@@ -39,10 +89,32 @@ DISPLAY_CYCLE_INTERVAL = 3  # seconds per screen (legacy, disabled with rotary)
 ROTARY_ENCODER_PIN_PUSH = 25    # Push button
 ROTARY_ENCODER_PIN_A = 26      # CLK
 ROTARY_ENCODER_PIN_B = 16      # DT
+INPUT_QUEUE_SIZE = 64           # encoder events waiting for the render thread
+ROTARY_VELOCITY_WINDOW = 0.15   # seconds of detents used to measure spin speed
+# (detents per second, step multiplier) - faster spins move sliders further
+ROTARY_ACCEL_CURVE = ((0, 1), (10, 2), (20, 4), (40, 8))
 
 # Display rendering
-RENDER_INTERVAL = 0.1  # Refresh display every N seconds (faster for smooth animations)
+FRAME_MIN_INTERVAL = 0.02  # Minimum seconds between frames (bursts of events are coalesced)
+ALARM_REFRESH_INTERVAL = 1  # seconds between frames during the alarm countdown
+
+# Input latency (encoder edge to I2C flush)
+LATENCY_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000)
+LATENCY_SAMPLE_WINDOW = 1000  # recent samples kept for p50/p99
+
+# Frames are drawn on input, new data snapshots and minute boundaries; tabs
+# showing sampled values also redraw every N seconds (None = events only)
+TAB_REFRESH_INTERVALS = {
+    "home": 5,
+    "system": 2,
+    "weather": None,
+    "network": 10,
+    "power": 30,
+    "timer": None,
+    "settings": None,
+}
 TEXT_CHAR_WIDTH = 6  # pixels per character (for centered text)
+TEXT_CACHE_SIZE = 256  # rasterized strings kept for reuse
 
 # Tab display labels
 TAB_LABELS = {
@@ -0,0 +1,158 @@
+"""Display-owner thread with frame double buffering and command coalescing"""
+
+import threading
+from PIL import Image
+
+
+class DisplayPipeline:
+    """
+    Owns all I2C traffic to the panel on a background thread
+
+    The render loop draws into a back buffer and submits it. Pending commands
+    are coalesced: only the newest frame and the last contrast value reach
+    the bus, and a frame submitted while the bus is busy replaces (drops)
+    the previous pending one instead of queueing.
+    """
+
+    # One buffer being flushed, one pending, one being drawn
+    BUFFER_COUNT = 3
+
+    def __init__(self, device, flusher, latency=None):
+        """
+        Initialize pipeline
+
+        Args:
+            device: luma device
+            flusher: PageFlusher used to send frames
+            latency: Optional LatencyTracker, fed input timestamps at flush
+        """
+        self.device = device
+        self.flusher = flusher
+        self.latency = latency
+        self.cond = threading.Condition()
+        self.free_buffers = [
+            Image.new(device.mode, device.size) for _ in range(self.BUFFER_COUNT)
+        ]
+
+        self.pending_frame = None
+        self.pending_timestamps = []
+        self.pending_contrast = None
+        self.pending_clear = False
+        self.applied_contrast = None
+
+        self.submitted_frames = 0
+        self.dropped_frames = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start the display thread"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def acquire_buffer(self):
+        """Get a blank back buffer to draw the next frame into (never blocks)"""
+        with self.cond:
+            image = self.free_buffers.pop() if self.free_buffers else None
+        if image is None:
+            return Image.new(self.device.mode, self.device.size)
+        image.paste(0, (0, 0) + image.size)
+        return image
+
+    def _recycle(self, frame):
+        """Return a frame's buffer to the free list (call with cond held)"""
+        if isinstance(frame, Image.Image):
+            self.free_buffers.append(frame)
+
+    def submit_frame(self, frame, timestamps=None):
+        """
+        Hand a finished back buffer (or a list of page bytes) to the display thread
+
+        Args:
+            frame: PIL image or page bytes
+            timestamps: Input edge times this frame shows (carried over if it is dropped)
+        """
+        with self.cond:
+            if timestamps:
+                self.pending_timestamps.extend(timestamps)
+            if self.pending_frame is not None:
+                # Bus is behind - the older frame is never shown
+                self._recycle(self.pending_frame)
+                self.dropped_frames += 1
+            self.pending_frame = frame
+            self.submitted_frames += 1
+            self.cond.notify()
+
+    def set_contrast(self, level):
+        """Queue a device contrast level (0-255), skipped if already applied"""
+        with self.cond:
+            if level == self.applied_contrast and self.pending_contrast is None:
+                return
+            self.pending_contrast = level
+            self.cond.notify()
+
+    def clear(self):
+        """Queue a display clear, discarding any frame not yet sent"""
+        with self.cond:
+            if self.pending_frame is not None:
+                self._recycle(self.pending_frame)
+                self.pending_frame = None
+            self.pending_clear = True
+            self.cond.notify()
+
+    def _has_work(self):
+        return (
+            self.pending_frame is not None
+            or self.pending_contrast is not None
+            or self.pending_clear
+        )
+
+    def _run(self):
+        """Display thread: apply clear, contrast and frame in that order"""
+        while True:
+            with self.cond:
+                while self.running and not self._has_work():
+                    self.cond.wait()
+                if not self.running and not self._has_work():
+                    return
+
+                frame, self.pending_frame = self.pending_frame, None
+                timestamps = []
+                if frame is not None:
+                    timestamps, self.pending_timestamps = self.pending_timestamps, []
+                contrast, self.pending_contrast = self.pending_contrast, None
+                clear, self.pending_clear = self.pending_clear, False
+
+            try:
+                if clear:
+                    self.device.clear()
+                    self.flusher.invalidate()
+                if contrast is not None and contrast != self.applied_contrast:
+                    self.device.contrast(contrast)
+                    self.applied_contrast = contrast
+                if frame is not None:
+                    self.flusher.flush(frame)
+                    if self.latency and timestamps:
+                        self.latency.record_since(timestamps)
+            except Exception as e:
+                print(f"Display thread error: {e}")
+            finally:
+                if frame is not None:
+                    with self.cond:
+                        self._recycle(frame)
+
+    def stop(self, timeout=2.0):
+        """Send anything still pending, then stop the display thread"""
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def get_stats(self):
+        """Get pipeline statistics"""
+        return {
+            "submitted_frames": self.submitted_frames,
+            "dropped_frames": self.dropped_frames,
+        }
@@ -0,0 +1,166 @@
+"""Inotify file watcher for hot-reloading configuration files"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from config import FILE_WATCH_DEBOUNCE
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Editors and our own atomic saves replace files by rename, so the
+# directory is watched rather than the file itself
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+
+def _load_libc():
+    """libc with inotify support, None where unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1  # Raises AttributeError off Linux
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    Calls back when watched files change, using raw inotify syscalls
+
+    The watcher thread blocks in select() with no timeout while nothing is
+    pending, so an idle watcher costs no CPU. Bursts of events for a file
+    (editors often write several times) are debounced into one callback.
+    """
+
+    def __init__(self, debounce=FILE_WATCH_DEBOUNCE):
+        """
+        Initialize watcher
+
+        Args:
+            debounce: Seconds a file must stay quiet before its callback runs
+        """
+        self.debounce = debounce
+        self.libc = _load_libc()
+        self.fd = None
+        self.wake_pipe = None  # Lets stop() interrupt select()
+        self.dirs = {}  # watch descriptor -> directory
+        self.callbacks = {}  # (directory, filename) -> [callback]
+        self.pending = {}  # path key -> monotonic time of the last event
+        self.running = False
+        self.thread = None
+
+    def watch(self, path, callback):
+        """
+        Register a file change callback:
+        callback(path)
+
+        Returns:
+            True if the file's directory is being watched
+        """
+        path = os.path.abspath(path)
+        directory, filename = os.path.split(path)
+        self.callbacks.setdefault((directory, filename), []).append(callback)
+
+        if directory in self.dirs.values():
+            return True
+        if not self._ensure_fd():
+            return False
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            print(f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}")
+            return False
+        self.dirs[wd] = directory
+        return True
+
+    def _ensure_fd(self):
+        """Create the inotify instance on first use"""
+        if self.fd is not None:
+            return True
+        if self.libc is None:
+            print("inotify unavailable, file changes will not be picked up")
+            return False
+        fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            print(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return False
+        self.fd = fd
+        self.wake_pipe = os.pipe()
+        return True
+
+    def start(self):
+        """Start the watcher thread (no-op if nothing could be watched)"""
+        if self.fd is None or self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Watching {len(self.callbacks)} file(s) for changes")
+
+    def stop(self):
+        """Stop watching"""
+        if self.fd is None:
+            return
+        self.running = False
+        os.write(self.wake_pipe[1], b"x")
+        if self.thread:
+            self.thread.join(1.0)
+        for fd in (self.fd,) + self.wake_pipe:
+            os.close(fd)
+        self.fd = None
+        self.wake_pipe = None
+
+    def _run(self):
+        """Read inotify events, run callbacks once a file has been quiet for `debounce`"""
+        while self.running:
+            timeout = None
+            if self.pending:
+                oldest = min(self.pending.values())
+                timeout = max(0.0, oldest + self.debounce - time.monotonic())
+
+            try:
+                readable, _, _ = select.select([self.fd, self.wake_pipe[0]], [], [], timeout)
+            except OSError as e:
+                print(f"File watcher error: {e}")
+                return
+            if not self.running:
+                return
+            if self.fd in readable:
+                self._read_events(os.read(self.fd, 4096))
+
+            self._fire_settled()
+
+    def _read_events(self, data):
+        """Mark watched files named in a buffer of inotify events as pending"""
+        now = time.monotonic()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            key = (self.dirs.get(wd), os.fsdecode(name))
+            if key in self.callbacks:
+                self.pending[key] = now
+
+    def _fire_settled(self):
+        """Run callbacks for files with no events during the debounce window"""
+        now = time.monotonic()
+        for key, last in list(self.pending.items()):
+            if now - last < self.debounce:
+                continue
+            del self.pending[key]
+            path = os.path.join(*key)
+            for callback in self.callbacks.get(key, []):
+                try:
+                    callback(path)
+                except Exception as e:
+                    print(f"File watch callback error ({path}): {e}")
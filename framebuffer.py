@@ -0,0 +1,119 @@
+"""SH1106 page framebuffer with dirty-page tracking"""
+
+from PIL import Image
+from config import FRAMEBUFFER_RANGE_GAP
+
+PAGE_HEIGHT = 8
+SET_PAGE_ADDRESS = 0xB0
+SET_HIGH_COLUMN = 0x10
+
+# PIL packs mode "1" rows MSB-first, SH1106 page bytes have the top row in the LSB
+_REVERSE_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def image_to_pages(image):
+    """
+    Convert a 1-bit image into SH1106 page bytes
+
+    Returns:
+        List of one bytes object per page, each `width` columns long
+    """
+    height = image.size[1]
+    pages = height // PAGE_HEIGHT
+    # Transposing turns every display column into one packed row of bits
+    columns = image.transpose(Image.TRANSPOSE).tobytes().translate(_REVERSE_BITS)
+    return [columns[page::pages] for page in range(pages)]
+
+
+def changed_ranges(old, new, gap=FRAMEBUFFER_RANGE_GAP):
+    """
+    Find the column ranges that differ between two pages
+
+    Ranges separated by fewer than `gap` unchanged columns are merged, since
+    re-addressing the column costs about as much as resending a few bytes.
+
+    Returns:
+        List of (start, end) tuples, end exclusive
+    """
+    ranges = []
+    start = end = None
+    for x in range(len(new)):
+        if old[x] == new[x]:
+            continue
+        if start is None:
+            start = x
+        elif x - end >= gap:
+            ranges.append((start, end))
+            start = x
+        end = x + 1
+    if start is not None:
+        ranges.append((start, end))
+    return ranges
+
+
+class PageFlusher:
+    """Sends only the SH1106 pages (or column ranges) that changed since the last frame"""
+
+    def __init__(self, device):
+        """
+        Initialize flusher
+
+        Args:
+            device: luma device providing command(), data() and preprocess()
+        """
+        self.device = device
+        self.pages = None  # Last frame sent, None forces a full update
+        self.column_offset = getattr(device, "_page_address_offset", 0x02)
+
+        self.frames = 0
+        self.skipped_frames = 0
+        self.last_bytes = 0
+        self.total_bytes = 0
+
+    def invalidate(self):
+        """Forget the last frame so the next flush sends every page"""
+        self.pages = None
+
+    def flush(self, frame):
+        """Send a 1-bit PIL image (or a list of page bytes), returns the number of bytes sent"""
+        if isinstance(frame, list):
+            return self.flush_pages(frame)
+        image = self.device.preprocess(frame)
+        return self.flush_pages(image_to_pages(image))
+
+    def flush_pages(self, pages):
+        """Send page bytes, returns the number of bytes sent"""
+        sent = 0
+        for page, data in enumerate(pages):
+            old = self.pages[page] if self.pages else None
+            if old == data:
+                continue
+
+            ranges = [(0, len(data))] if old is None else changed_ranges(old, data)
+            for start, end in ranges:
+                column = start + self.column_offset
+                self.device.command(
+                    SET_PAGE_ADDRESS + page,
+                    column & 0x0F,
+                    SET_HIGH_COLUMN | (column >> 4)
+                )
+                self.device.data(list(data[start:end]))
+                sent += 3 + (end - start)
+
+        self.pages = pages
+        self.frames += 1
+        if sent == 0:
+            self.skipped_frames += 1
+        self.last_bytes = sent
+        self.total_bytes += sent
+        return sent
+
+    def get_stats(self):
+        """Get flush statistics (bytes are command + data payload)"""
+        return {
+            "frames": self.frames,
+            "skipped_frames": self.skipped_frames,
+            "last_bytes": self.last_bytes,
+            "total_bytes": self.total_bytes,
+            "avg_bytes": self.total_bytes / self.frames if self.frames else 0,
+        }
@@ -0,0 +1,265 @@
+"""Shared HTTP client: pooled connections, rate limits, conditional GETs and circuit breaking"""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HTTP_USER_AGENT,
+    HTTP_TIMEOUT,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_RETRY_BASE_DELAY,
+    HTTP_HOST_MIN_INTERVAL,
+    HTTP_BREAKER_THRESHOLD,
+    HTTP_BREAKER_BASE_DELAY,
+    HTTP_BREAKER_MAX_DELAY,
+    HTTP_VALIDATOR_CACHE_SIZE
+)
+
+# Statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpError(Exception):
+    """Request failed after retries"""
+
+
+class CircuitOpenError(HttpError):
+    """Host has failed repeatedly; requests are refused until it cools down"""
+
+
+def jittered(delay):
+    """Randomize a delay to +-50% so clients don't retry in lockstep"""
+    return delay * random.uniform(0.5, 1.5)
+
+
+class HttpClient:
+    """
+    One keep-alive Session for all outbound calls
+
+    - Connections are pooled per host, so repeat calls skip TCP/TLS setup
+    - Requests to a host are spaced by HTTP_HOST_MIN_INTERVAL
+    - Responses carrying ETag / Last-Modified are revalidated with
+      If-None-Match / If-Modified-Since; a 304 returns the cached body
+      (the HTTP_VALIDATOR_CACHE_SIZE most recently used requests are kept)
+    - Transient failures retry with jittered exponential backoff
+    - After HTTP_BREAKER_THRESHOLD consecutive failures a host's circuit
+      opens and calls fail fast until the (growing, jittered) cool-down ends
+
+    Calls may sleep (rate limit, retries), so use it from background threads.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = HTTP_USER_AGENT
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.lock = threading.Lock()
+        self.validators = OrderedDict()  # request key -> (etag, last_modified, json body), LRU
+        self.hosts = {}  # host -> {"next_request", "failures", "open_until"}
+        self.stats = {}  # endpoint -> counters
+
+    # ==============================
+    # Per-host state
+    # ==============================
+
+    def _host(self, host):
+        """Rate limit / breaker state for a host (call with lock held)"""
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = {"next_request": 0.0, "failures": 0, "open_until": 0.0}
+        return state
+
+    def _wait_turn(self, host):
+        """Enforce the host's minimum request spacing (sleeps if needed)"""
+        interval = HTTP_HOST_MIN_INTERVAL.get(host, HTTP_HOST_MIN_INTERVAL.get("default", 0))
+        with self.lock:
+            state = self._host(host)
+            if time.monotonic() < state["open_until"]:
+                raise CircuitOpenError(f"{host} unavailable, circuit open")
+            now = time.monotonic()
+            start = max(now, state["next_request"])
+            state["next_request"] = start + interval
+        if start > now:
+            time.sleep(start - now)
+
+    def _record_result(self, host, ok):
+        """Close the circuit on success, open it after repeated failures"""
+        with self.lock:
+            state = self._host(host)
+            if ok:
+                state["failures"] = 0
+                state["open_until"] = 0.0
+                return
+            state["failures"] += 1
+            excess = state["failures"] - HTTP_BREAKER_THRESHOLD
+            if excess >= 0:
+                delay = min(HTTP_BREAKER_MAX_DELAY, HTTP_BREAKER_BASE_DELAY * 2 ** excess)
+                state["open_until"] = time.monotonic() + jittered(delay)
+                print(f"HTTP circuit open for {host} ({state['failures']} failures)")
+
+    def _count(self, endpoint, elapsed_ms, error=None, not_modified=False):
+        """Update per-endpoint counters"""
+        with self.lock:
+            stats = self.stats.setdefault(endpoint, {
+                "requests": 0, "errors": 0, "not_modified": 0,
+                "total_ms": 0.0, "last_ms": 0.0, "last_error": None
+            })
+            stats["requests"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["last_ms"] = round(elapsed_ms, 1)
+            if not_modified:
+                stats["not_modified"] += 1
+            if error:
+                stats["errors"] += 1
+                stats["last_error"] = error
+
+    # ==============================
+    # Requests
+    # ==============================
+
+    def get_json(self, url, params=None, headers=None, timeout=HTTP_TIMEOUT):
+        """
+        GET a JSON document
+
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            headers: Extra request headers
+            timeout: Seconds per attempt
+
+        Returns:
+            Decoded JSON body (the cached body on 304 Not Modified)
+
+        Raises:
+            CircuitOpenError: Host is cooling down, no request was made
+            HttpError: All attempts failed
+        """
+        parts = urlsplit(url)
+        host = parts.hostname
+        endpoint = f"{host}{parts.path}"
+        key = (url, tuple(sorted((params or {}).items())))
+
+        last_error = None
+        for attempt in range(HTTP_RETRIES + 1):
+            if attempt:
+                time.sleep(jittered(HTTP_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            self._wait_turn(host)
+
+            request_headers = dict(headers or {})
+            with self.lock:
+                cached = self.validators.get(key)
+                if cached:
+                    self.validators.move_to_end(key)
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    request_headers["If-None-Match"] = etag
+                if last_modified:
+                    request_headers["If-Modified-Since"] = last_modified
+
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+                elapsed_ms = (time.monotonic() - start) * 1000
+
+                if response.status_code == 304 and cached:
+                    self._count(endpoint, elapsed_ms, not_modified=True)
+                    self._record_result(host, True)
+                    return cached[2]
+                if response.status_code == 304:
+                    # Nothing to reuse (a proxy answered, or the validator was
+                    # evicted): ask once more for the full body
+                    with self.lock:
+                        self.validators.pop(key, None)
+                    self._wait_turn(host)
+                    response = self.session.get(
+                        url, params=params,
+                        headers=dict(headers or {}, **{"Cache-Control": "no-cache"}),
+                        timeout=timeout
+                    )
+                    elapsed_ms = (time.monotonic() - start) * 1000
+                    if response.status_code == 304:
+                        # Our side has no body to serve; the host is fine
+                        raise requests.HTTPError("304 Not Modified without a cached body",
+                                                 response=response)
+
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        # Respect the server's pacing for this host
+                        with self.lock:
+                            state = self._host(host)
+                            state["next_request"] = max(state["next_request"],
+                                                        time.monotonic() + int(retry_after))
+                    raise HttpError(f"HTTP {response.status_code}")
+
+                response.raise_for_status()
+                body = response.json()
+            except CircuitOpenError:
+                raise
+            except (requests.RequestException, HttpError, ValueError) as e:
+                elapsed_ms = (time.monotonic() - start) * 1000
+                last_error = str(e)
+                self._count(endpoint, elapsed_ms, error=last_error)
+                # Client errors (other than 429) say nothing about the host's
+                # health and will not get better by retrying
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status is not None and status < 500 and status != 429:
+                    break
+                self._record_result(host, False)
+                continue
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                with self.lock:
+                    self.validators[key] = (etag, last_modified, body)
+                    self.validators.move_to_end(key)
+                    if len(self.validators) > HTTP_VALIDATOR_CACHE_SIZE:
+                        self.validators.popitem(last=False)
+            self._count(endpoint, elapsed_ms)
+            self._record_result(host, True)
+            return body
+
+        raise HttpError(f"{endpoint} failed: {last_error}")
+
+    def get_stats(self):
+        """Per-endpoint counters with average latency, and circuit state per host"""
+        now = time.monotonic()
+        with self.lock:
+            endpoints = {
+                endpoint: dict(
+                    stats,
+                    total_ms=round(stats["total_ms"], 1),
+                    avg_ms=round(stats["total_ms"] / stats["requests"], 1) if stats["requests"] else 0.0
+                )
+                for endpoint, stats in self.stats.items()
+            }
+            hosts = {
+                host: {
+                    "failures": state["failures"],
+                    "circuit_open": now < state["open_until"],
+                }
+                for host, state in self.hosts.items()
+            }
+        return {"endpoints": endpoints, "hosts": hosts}
+
+
+_client = None
+
+
+def get_client():
+    """Shared HttpClient instance"""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
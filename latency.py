@@ -0,0 +1,73 @@
+"""Input-to-display latency histogram"""
+
+import threading
+import time
+from collections import deque
+from config import LATENCY_BUCKETS_MS, LATENCY_SAMPLE_WINDOW
+
+
+class LatencyTracker:
+    """
+    Records the time from an input edge to the I2C flush that shows it
+
+    Keeps cumulative bucket counts for the lifetime of the service and a
+    window of recent samples for exact percentiles.
+    """
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS, window=LATENCY_SAMPLE_WINDOW):
+        """
+        Initialize tracker
+
+        Args:
+            buckets_ms: Ascending bucket upper bounds in milliseconds
+            window: Number of recent samples kept for percentiles
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Last bucket is overflow
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self.max_ms = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms):
+        """Add one latency sample in milliseconds"""
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if latency_ms <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.samples.append(latency_ms)
+            self.total += 1
+            self.max_ms = max(self.max_ms, latency_ms)
+
+    def record_since(self, timestamps, now=None):
+        """Record latency for each time.monotonic() input timestamp up to now"""
+        if now is None:
+            now = time.monotonic()
+        for stamp in timestamps:
+            self.record((now - stamp) * 1000.0)
+
+    def percentile(self, pct):
+        """Percentile (0-100) of recent samples in milliseconds, None if empty"""
+        with self.lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def get_stats(self):
+        """Get percentiles and the bucket histogram"""
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        with self.lock:
+            labels = [f"<={bound}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+            return {
+                "count": self.total,
+                "p50_ms": round(p50, 2) if p50 is not None else None,
+                "p99_ms": round(p99, 2) if p99 is not None else None,
+                "max_ms": round(self.max_ms, 2),
+                "histogram": dict(zip(labels, self.counts)),
+            }
@@ -8,7 +8,7 @@ import time
 import threading
 from datetime import datetime
 
-from config import WAKE_CHECK_INTERVAL, RENDER_INTERVAL
+from config import WIFI_CHECK_INTERVAL, WAKE_FILE
 from display import DisplayManager
 from rotary_encoder import RotaryEncoderHandler
 from menu_manager import TabManager
@@ -18,6 +18,8 @@ from weather import WeatherManager
 from wifi_manager import WiFiManager
 from wake_timer import WakeTimer
 from web_server import WebServer
+from scheduler import FrameScheduler
+from file_watcher import FileWatcher
 
 
 def main():
@@ -30,10 +32,11 @@ def main():
     display_mgr = DisplayManager(contrast=settings_mgr.get_contrast())
     menu_mgr = TabManager(settings_mgr)
 
-    weather_mgr = WeatherManager()
+    weather_mgr = WeatherManager(settings_mgr)
     wifi_mgr = WiFiManager()
-    wake_timer = WakeTimer()
-    web_server = WebServer(wake_timer)
+    scheduler = FrameScheduler()
+    wake_timer = WakeTimer(settings_mgr, on_fire=lambda: scheduler.request_render("alarm"))
+    web_server = WebServer(wake_timer, display_mgr)
 
     # ==============================
     # Initialize rotary encoder
@@ -47,40 +50,53 @@ def main():
     # ==============================
     # Rotary Callbacks
     # ==============================
-    def on_rotate(direction, steps):
-        print(f"[Encoder] Rotated: {'CW' if direction > 0 else 'CCW'}")
+    # Callbacks only queue the event; the render loop applies it
+    def on_rotate(direction, steps, timestamp=None, accel_steps=None):
+        print(f"[Encoder] Rotated: {'CW' if direction > 0 else 'CCW'} x{steps}")
+        menu_mgr.post_event("rotate", direction, steps, accel_steps)
+        scheduler.request_render("input", timestamp)
 
-        if menu_mgr.current_mode.value == "view":
-            menu_mgr.rotate_tabs(direction)
-
-        elif menu_mgr.current_mode.value == "menu":
-            menu_mgr.rotate_menu(direction)
-
-        elif menu_mgr.current_mode.value == "edit":
-            menu_mgr.rotate_edit_value(direction)
-
-    def on_button_press():
+    def on_button_press(timestamp=None):
         print("[Encoder] Button pressed")
-        action = menu_mgr.handle_button_press()
-        print(f"[Action] {action}")
+        menu_mgr.post_event("press")
+        scheduler.request_render("input", timestamp)
 
     rotary.on_rotation(on_rotate)
     rotary.on_button_press(on_button_press)
 
+    # Pressing the button on the weather tab cycles through the locations
+    def on_action(action):
+        if action == "next_location":
+            weather_mgr.next_location()
+
+    menu_mgr.add_listener(on_action)
+
     # ==============================
     # Start background services
     # ==============================
     print("Starting services...")
     web_server.start()
+    wake_timer.start()
+
+    # Pick up edits to the settings and legacy wake files without a restart
+    file_watcher = FileWatcher()
+    file_watcher.watch(settings_mgr.settings_file, settings_mgr.reload)
+    file_watcher.watch(WAKE_FILE, wake_timer.reload_legacy)
+    file_watcher.start()
+    wifi_mgr.add_listener(lambda state: scheduler.request_render("network"))
+    wifi_mgr.add_listener(weather_mgr.on_network_change)
+    wifi_mgr.start_event_monitor()
+    network = wifi_mgr.get_snapshot()
+    weather_mgr.start_location_resolver(network["ssid"], network["ip"])
 
     def wifi_monitor():
         while True:
             try:
                 wifi_mgr.check_connection()
-                time.sleep(5)
+                time.sleep(WIFI_CHECK_INTERVAL)
             except Exception as e:
                 print(f"WiFi monitor error: {e}")
-                time.sleep(5)
+                time.sleep(WIFI_CHECK_INTERVAL)
 
     def weather_monitor():
         while True:
@@ -88,7 +104,13 @@ def main():
                 if weather_mgr.should_update():
                     print("Updating weather...")
                     weather_mgr.fetch_weather()
-                time.sleep(600)  # 10 minutes instead of 30 seconds
+                else:
+                    # Between fetches the shown values come from the stored forecast
+                    weather_mgr.refresh_current()
+                scheduler.request_render("weather")
+                # Sleep until the next local refresh, the data expiring, the
+                # retry backoff ending or the location changing
+                weather_mgr.wait_until_due()
             except Exception as e:
                 print(f"Weather monitor error: {e}")
                 time.sleep(600)
@@ -99,28 +121,64 @@ def main():
     print("All services started")
     print("Main loop running...")
 
-    last_render_time = 0
+    # Contrast reaches the panel only when the setting changes
+    settings_mgr.subscribe("contrast", lambda key, value: display_mgr.set_contrast(value))
+
+    settings_cache = {"version": None, "data": None}
+
+    def settings_data():
+        """Settings shown on screen, rebuilt only when a setting changed"""
+        if settings_cache["version"] != settings_mgr.version:
+            settings_cache["version"] = settings_mgr.version
+            settings_cache["data"] = {
+                "brightness": settings_mgr.get_brightness(),
+                "contrast": settings_mgr.get_contrast(),
+                "wake_time": settings_mgr.get("wake_time", "07:30"),
+                "settings_version": settings_mgr.version,
+            }
+        return settings_cache["data"]
+
+    def navigation_data(now):
+        """Frame data that changes with encoder input"""
+        return {
+            "now": now,
+            "weather": weather_mgr.weather_data,
+            "active_tab": menu_mgr.get_tab_name(),
+            "tab_labels": menu_mgr.get_all_tab_labels(),
+            "menu_state": menu_mgr.get_state(),
+            **settings_data(),
+        }
+
+    display_data = None
 
     try:
         while True:
+            # Sleep until input, new data, a minute boundary or a tab refresh
+            reasons = scheduler.wait_for_frame(menu_mgr.get_tab_name(), wake_timer.is_active)
+            menu_mgr.drain_events()
             now = datetime.now()
 
-            # Throttle rendering
-            current_time = time.time()
-            if current_time - last_render_time < RENDER_INTERVAL:
-                time.sleep(0.05)
+            # Input-only frame: redraw with the last data snapshot, skip collection
+            if reasons == {"input"} and display_data:
+                if (menu_mgr.get_state()["version"] == display_data["menu_state"]["version"]
+                        and settings_mgr.version == display_data["settings_version"]
+                        and weather_mgr.weather_data is display_data["weather"]):
+                    # Nothing on screen changed (e.g. a press outside settings)
+                    display_mgr.latency.record_since(scheduler.frame_timestamps)
+                    continue
+                display_data.update(navigation_data(now))
+                display_mgr.render(display_data, timestamps=scheduler.frame_timestamps)
                 continue
 
-            last_render_time = current_time
-
             # ==============================
             # Collect System Data
             # ==============================
             stats = get_system_stats()
-            ip_status = wifi_mgr.get_ip_status()
-            signal_dbm = wifi_mgr.get_signal_strength()
+            network = wifi_mgr.get_snapshot()
+            ip_status = network["ip_status"]
+            signal_dbm = network["dbm"]
             signal_icon = wifi_mgr.signal_to_icon(signal_dbm)
-            wifi_name = wifi_mgr.get_wifi_name()
+            wifi_name = network["ssid"]
 
             network_info = {
                 "ssid": wifi_name,
@@ -128,40 +186,32 @@ def main():
                 "dbm": signal_dbm
             }
 
-            wake_timer.check_alarm(now)
             remaining = wake_timer.update()
 
-            menu_state = menu_mgr.get_state()
-
             # ==============================
             # Prepare display data
             # ==============================
             display_data = {
-                "now": now,
                 "stats": stats,
-                "weather": weather_mgr.weather_data,
                 "ip_status": ip_status,
                 "signal": network_info,
                 "wake_active": wake_timer.is_active,
                 "remaining_time": remaining or 0,
-                "active_tab": menu_mgr.get_tab_name(),
-                "tab_labels": menu_mgr.get_all_tab_labels(),
-                "menu_state": menu_state,
-                "brightness": settings_mgr.get_brightness(),
-                "contrast": settings_mgr.get_contrast(),
-                "wake_time": settings_mgr.get("wake_time", "07:30"),
+                **navigation_data(now),
                 # Additional data for new screens
                 "battery_percent": max(5, 100 - (stats.get('uptime_hours', 0) % 48) * 2),
             }
 
-            display_mgr.render(display_data)
-
-            time.sleep(WAKE_CHECK_INTERVAL)
+            display_mgr.render(display_data, timestamps=scheduler.frame_timestamps)
 
     except KeyboardInterrupt:
         print("\nShutting down...")
         rotary.cleanup()
+        wake_timer.stop()
+        file_watcher.stop()
         display_mgr.clear()
+        display_mgr.close()
+        settings_mgr.flush()
         web_server.stop()
         print("Goodbye!")
 
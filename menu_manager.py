@@ -1,6 +1,10 @@
 """Menu and tab navigation manager"""
 
+import threading
+from collections import deque
 from enum import Enum
+from types import MappingProxyType
+from config import INPUT_QUEUE_SIZE
 
 
 class Mode(Enum):
@@ -11,7 +15,13 @@ class Mode(Enum):
 
 
 class TabManager:
-    """Manages tab/screen navigation and state"""
+    """
+    Manages tab/screen navigation and state
+    
+    Encoder callbacks only queue events (post_event). The render thread
+    applies them (drain_events) and publishes an immutable, versioned
+    snapshot (get_state), so a frame never sees a half-applied change.
+    """
     
     # Define all available tabs
     TABS = [
@@ -47,12 +57,24 @@ class TabManager:
         self.edit_value = None
         self.edit_item = None
         
+        # Input events from the encoder thread, applied by the render thread
+        self.events = deque(maxlen=INPUT_QUEUE_SIZE)
+        self.events_lock = threading.Lock()
+        self.dropped_events = 0
+        self.listeners = []  # callback(action) after each button action
+        
+        # Published navigation state
+        self.version = 0
+        self.published = None
+        self.snapshot = None
+        
         # Load last tab from settings
         last_tab = settings_mgr.get_last_tab()
         for tab in self.TABS:
             if tab["name"] == last_tab:
                 self.active_tab_index = tab["index"]
                 break
+        self._publish()
     
     def get_active_tab(self):
         """Get currently active tab"""
@@ -74,15 +96,16 @@ class TabManager:
             labels.append(label)
         return " ".join(labels)
     
-    def rotate_tabs(self, direction):
+    def rotate_tabs(self, direction, steps=1):
         """
         Rotate to next/previous tab
         
         Args:
             direction: 1 for right (next), -1 for left (previous)
+            steps: Number of tabs to move
         """
         if self.current_mode == Mode.VIEW:
-            self.active_tab_index = (self.active_tab_index + direction) % len(self.TABS)
+            self.active_tab_index = (self.active_tab_index + direction * steps) % len(self.TABS)
             self.settings_mgr.set_last_tab(self.get_tab_name())
             print(f"Switched to tab: {self.get_tab_name()}")
     
@@ -101,15 +124,16 @@ class TabManager:
         self.edit_value = None
         print("Exited settings menu")
     
-    def rotate_menu(self, direction):
+    def rotate_menu(self, direction, steps=1):
         """
         Navigate menu items
         
         Args:
             direction: 1 for down, -1 for up
+            steps: Number of items to move
         """
         if self.current_mode == Mode.MENU:
-            self.menu_index = (self.menu_index + direction) % len(self.SETTINGS_ITEMS)
+            self.menu_index = (self.menu_index + direction * steps) % len(self.SETTINGS_ITEMS)
             print(f"Menu item: {self.SETTINGS_ITEMS[self.menu_index]['label']}")
     
     def get_current_menu_item(self):
@@ -149,21 +173,23 @@ class TabManager:
             self.edit_item = None
             self.edit_value = None
     
-    def rotate_edit_value(self, direction):
+    def rotate_edit_value(self, direction, steps=1):
         """
         Change value in edit mode
         
         Args:
             direction: 1 to increase, -1 to decrease
+            steps: Slider units to move (the encoder's accelerated step count)
         """
         if self.current_mode == Mode.EDIT and self.edit_item:
             item = self.edit_item
             if item["type"] == "slider":
-                step = 1
-                self.edit_value += direction * step
+                self.edit_value += direction * steps
                 self.edit_value = max(item["min"], min(item["max"], self.edit_value))
                 print(f"{item['label']}: {self.edit_value}")
             elif item["type"] == "toggle":
+                if steps % 2 == 0:
+                    return  # An even number of flips lands on the same value
                 if isinstance(self.edit_value, bool):
                     self.edit_value = not self.edit_value
                 else:
@@ -184,6 +210,8 @@ class TabManager:
             if self.get_tab_name() == "settings":
                 self.enter_settings_menu()
                 return "entered_settings"
+            elif self.get_tab_name() == "weather":
+                return "next_location"
             else:
                 # Could expand to show more details for other tabs
                 return "button_pressed"
@@ -198,14 +226,93 @@ class TabManager:
         
         return "no_action"
     
-    def get_state(self):
-        """Get full navigation state for display"""
-        return {
+    def handle_rotation(self, direction, steps=1, accel_steps=None):
+        """
+        Handle encoder rotation based on current mode
+        
+        Args:
+            direction: 1 (CW) or -1 (CCW)
+            steps: Detents turned
+            accel_steps: Accelerated step count, used by sliders
+        """
+        if self.current_mode == Mode.VIEW:
+            self.rotate_tabs(direction, steps)
+        elif self.current_mode == Mode.MENU:
+            self.rotate_menu(direction, steps)
+        elif self.current_mode == Mode.EDIT:
+            self.rotate_edit_value(direction, accel_steps or steps)
+    
+    # ==============================
+    # Input events
+    # ==============================
+    
+    def add_listener(self, callback):
+        """
+        Register a button action callback (called on the render thread):
+        callback(action)
+        """
+        self.listeners.append(callback)
+    
+    def post_event(self, kind, direction=0, steps=1, accel_steps=None):
+        """
+        Queue an input event (safe to call from the encoder thread)
+        
+        Args:
+            kind: "rotate" or "press"
+            direction, steps, accel_steps: Rotation details
+        """
+        with self.events_lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped_events += 1  # Oldest event is discarded
+            self.events.append((kind, direction, steps, accel_steps))
+    
+    def drain_events(self):
+        """
+        Apply all queued input events and publish the new state
+        (call from the render thread)
+        
+        Returns:
+            Number of events applied
+        """
+        with self.events_lock:
+            events = list(self.events)
+            self.events.clear()
+        
+        for kind, direction, steps, accel_steps in events:
+            if kind == "rotate":
+                self.handle_rotation(direction, steps, accel_steps)
+            elif kind == "press":
+                action = self.handle_button_press()
+                print(f"[Action] {action}")
+                for callback in self.listeners:
+                    try:
+                        callback(action)
+                    except Exception as e:
+                        print(f"Action listener error ({action}): {e}")
+        
+        if events:
+            self._publish()
+        return len(events)
+    
+    def _publish(self):
+        """Publish a new snapshot if the navigation state changed"""
+        editing = self.current_mode == Mode.EDIT
+        state = {
             "mode": self.current_mode.value,
             "active_tab": self.get_tab_name(),
             "tab_labels": self.get_all_tab_labels(),
             "menu_index": self.menu_index if self.current_mode == Mode.MENU else None,
-            "menu_item": self.get_current_menu_item(),
+            # The item being edited stays visible in edit mode
+            "menu_item": self.edit_item if editing else self.get_current_menu_item(),
             "edit_item": self.edit_item,
             "edit_value": self.edit_value,
         }
+        if state == self.published:
+            return
+        self.published = state
+        self.version += 1
+        self.snapshot = MappingProxyType(dict(state, version=self.version))
+    
+    def get_state(self):
+        """Get the published navigation state (read-only, includes "version")"""
+        return self.snapshot
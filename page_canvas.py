@@ -0,0 +1,179 @@
+"""NumPy-backed 1-bpp framebuffer in SH1106 page order"""
+
+from PIL import Image, ImageDraw
+
+try:
+    import numpy as np
+except ImportError:  # Optional - DisplayManager falls back to the PIL engine
+    np = None
+
+PAGE_HEIGHT = 8
+MAX_HEIGHT = 64  # One uint64 per column
+
+
+def _row_mask(y0, y1):
+    """uint64 with bits y0..y1 (inclusive) set"""
+    return np.uint64(((1 << (y1 + 1)) - 1) ^ ((1 << y0) - 1))
+
+
+class PageCanvas:
+    """
+    Drawing surface stored as one uint64 per display column
+
+    Bit y of column x is pixel (x, y), so the little-endian bytes of the
+    column array viewed as (width, pages) and transposed are exactly the
+    SH1106 page layout (LSB = top row of each page). Frames go to the
+    device without any image conversion.
+
+    Implements the subset of ImageDraw used by DisplayManager (line,
+    rectangle, bitmap, ellipse) so the same widgets draw onto either engine.
+    Assumes an unrotated device.
+    """
+
+    def __init__(self, width, height):
+        if np is None:
+            raise RuntimeError("numpy is required for the page canvas engine")
+        if height > MAX_HEIGHT or height % PAGE_HEIGHT:
+            raise ValueError(f"Unsupported display height: {height}")
+        self.width = width
+        self.height = height
+        self.columns = np.zeros(width, dtype="<u8")
+        self.converted = {}  # id(image) -> (image, columns) for layers and text bitmaps
+
+    # ==============================
+    # Buffer access
+    # ==============================
+
+    @property
+    def pages(self):
+        """(pages, width) uint8 view of the buffer in SH1106 page order"""
+        return self.columns.view(np.uint8).reshape(self.width, 8)[:, :self.height // PAGE_HEIGHT].T
+
+    def to_pages(self):
+        """Page bytes ready for PageFlusher.flush_pages"""
+        return [page.tobytes() for page in self.pages]
+
+    def to_image(self):
+        """Convert the buffer to a 1-bit PIL image"""
+        bits = (self.columns[None, :] >> np.arange(self.height, dtype="<u8")[:, None]) & np.uint64(1)
+        return Image.fromarray((bits * 255).astype(np.uint8), "L").convert("1")
+
+    def image_columns(self, image):
+        """Convert a 1-bit PIL image to column masks (cached per image object)"""
+        entry = self.converted.get(id(image))
+        if entry is not None and entry[0] is image:
+            return entry[1]
+
+        columns = self._convert(image)
+        if len(self.converted) > 512:
+            self.converted.clear()
+        self.converted[id(image)] = (image, columns)
+        return columns
+
+    @staticmethod
+    def _convert(image):
+        """Pack a 1-bit image into one uint64 per column"""
+        pixels = np.zeros((MAX_HEIGHT, image.size[0]), dtype=bool)
+        pixels[:image.size[1]] = np.asarray(image.convert("1"), dtype=bool)
+        packed = np.packbits(pixels, axis=0, bitorder="little")  # (8, width)
+        return np.ascontiguousarray(packed.T).view("<u8").ravel()
+
+    def paste(self, image):
+        """Replace the whole buffer with a full-size 1-bit image (e.g. a static layer)"""
+        self.columns[:] = self.image_columns(image)
+
+    def clear(self):
+        """Blank the buffer"""
+        self.columns[:] = 0
+
+    # ==============================
+    # Primitives (ImageDraw-compatible)
+    # ==============================
+
+    def _apply(self, x0, x1, mask, fill):
+        """Set (fill != 0) or clear mask bits in columns x0..x1 inclusive"""
+        x0 = max(0, x0)
+        x1 = min(self.width - 1, x1)
+        if x0 > x1:
+            return
+        if fill:
+            self.columns[x0:x1 + 1] |= mask
+        else:
+            self.columns[x0:x1 + 1] &= ~mask
+
+    def _span(self, y0, y1):
+        """Row mask for y0..y1 clipped to the buffer, None if empty"""
+        y0 = max(0, y0)
+        y1 = min(self.height - 1, y1)
+        return _row_mask(y0, y1) if y0 <= y1 else None
+
+    def line(self, xy, fill=None, width=1):
+        """Draw a line; horizontal and vertical lines are vectorized"""
+        x0, y0, x1, y1 = xy
+        if fill is None:
+            return
+        if y0 == y1 and width == 1:
+            mask = self._span(y0, y0)
+            if mask is not None:
+                self._apply(min(x0, x1), max(x0, x1), mask, fill)
+        elif x0 == x1 and width == 1:
+            mask = self._span(min(y0, y1), max(y0, y1))
+            if mask is not None:
+                self._apply(x0, x0, mask, fill)
+        else:
+            self._via_pil(lambda d: d.line(xy, fill=fill, width=width))
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        """Draw a rectangle with inclusive corners (fill first, then 1px outline)"""
+        x0, y0, x1, y1 = xy
+        # Thick outlines, and Pillow's two-row outline of a zero-height box
+        if outline is not None and (width != 1 or y0 == y1):
+            self._via_pil(lambda d: d.rectangle(xy, fill=fill, outline=outline, width=width))
+            return
+
+        if fill is not None:
+            mask = self._span(y0, y1)
+            if mask is not None:
+                self._apply(x0, x1, mask, fill)
+
+        if outline is not None and outline != fill:
+            edges = self._span(y0, y0)
+            if y1 != y0:
+                bottom = self._span(y1, y1)
+                edges = bottom if edges is None else (edges if bottom is None else edges | bottom)
+            if edges is not None:
+                self._apply(x0, x1, edges, outline)
+            sides = self._span(y0, y1)
+            if sides is not None:
+                self._apply(x0, x0, sides, outline)
+                self._apply(x1, x1, sides, outline)
+
+    def bitmap(self, xy, bitmap, fill=None):
+        """Blit a 1-bit mask: pixels set in the mask get fill"""
+        if fill is None:
+            return
+        x, y = xy
+        if not -MAX_HEIGHT < y < MAX_HEIGHT:
+            return
+        columns = self.image_columns(bitmap)
+        shifted = columns << np.uint64(y) if y >= 0 else columns >> np.uint64(-y)
+
+        start = max(0, x)
+        end = min(self.width, x + len(columns))
+        if start >= end:
+            return
+        part = shifted[start - x:end - x]
+        if fill:
+            self.columns[start:end] |= part
+        else:
+            self.columns[start:end] &= ~part
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        """Draw an ellipse (rasterized by PIL)"""
+        self._via_pil(lambda d: d.ellipse(xy, fill=fill, outline=outline, width=width))
+
+    def _via_pil(self, draw_op):
+        """Fallback for shapes without a vectorized primitive"""
+        image = self.to_image()
+        draw_op(ImageDraw.Draw(image))
+        self.columns[:] = self._convert(image)
@@ -0,0 +1,122 @@
+"""Persistent-descriptor readers for /proc and sysfs sources"""
+
+import os
+import re
+from config import THERMAL_ZONE_FILE, DISK_USAGE_PATH
+
+
+# Parsers run directly on the read buffer (re accepts memoryviews)
+CPU_LINE = re.compile(rb"(cpu\d*) +([^\n]*)\n")  # Matched line by line from the top
+MEM_TOTAL = re.compile(rb"^MemTotal:\s+(\d+)", re.M)
+MEM_AVAILABLE = re.compile(rb"^MemAvailable:\s+(\d+)", re.M)
+NUMBER = re.compile(rb"\s*(-?[\d.]+)")
+
+
+class ProcFile:
+    """A /proc or sysfs file kept open and re-read from offset 0"""
+
+    def __init__(self, path, size=1024):
+        """
+        Open the file once
+
+        Args:
+            path: File to read
+            size: Initial read buffer size (grows if the file is larger)
+        """
+        self.path = path
+        self.buffer = bytearray(size)
+        try:
+            self.fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self.fd = None
+
+    @property
+    def available(self):
+        """True if the file could be opened"""
+        return self.fd is not None
+
+    def read(self):
+        """
+        Re-read the whole file into the reused buffer
+
+        Returns:
+            memoryview of the content (no copy, valid until the next read),
+            None if the file is unavailable
+        """
+        if self.fd is None:
+            return None
+
+        n = os.preadv(self.fd, [self.buffer], 0)
+        while n == len(self.buffer):
+            # Content did not fit - grow once and read again
+            self.buffer = bytearray(len(self.buffer) * 2)
+            n = os.preadv(self.fd, [self.buffer], 0)
+        return memoryview(self.buffer)[:n]
+
+    def close(self):
+        """Close the file descriptor"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class SystemReader:
+    """Probes the available sensors once and reads each source with one syscall"""
+
+    def __init__(self):
+        self.stat = ProcFile("/proc/stat", size=4096)
+        self.uptime = ProcFile("/proc/uptime", size=64)
+        self.meminfo = ProcFile("/proc/meminfo", size=4096)
+        self.thermal = ProcFile(THERMAL_ZONE_FILE, size=32)
+
+        # Report missing sensors once instead of every frame
+        for source in (self.stat, self.uptime, self.meminfo, self.thermal):
+            if not source.available:
+                print(f"[Monitor] {source.path} not available, skipping")
+
+    def read_stat(self):
+        """Raw /proc/stat contents (memoryview, valid until the next read)"""
+        return self.stat.read()
+
+    def read_cpu_temperature(self):
+        """CPU temperature in Celsius, or None if there is no thermal zone"""
+        data = self.thermal.read()
+        match = NUMBER.match(data) if data else None
+        if not match:
+            return None
+        return round(int(match.group(1)) / 1000.0, 1)  # Convert millidegrees to degrees
+
+    def read_uptime_seconds(self):
+        """Uptime in seconds as float"""
+        data = self.uptime.read()
+        match = NUMBER.match(data) if data else None
+        if not match:
+            return None
+        return float(match.group(1))
+
+    def read_memory_percent(self):
+        """Used memory percentage (same formula as psutil.virtual_memory)"""
+        data = self.meminfo.read()
+        if not data:
+            return None
+
+        total = MEM_TOTAL.search(data)
+        available = MEM_AVAILABLE.search(data)
+        if not total or not available or not int(total.group(1)):
+            return None
+        total = int(total.group(1))
+        available = int(available.group(1))
+        return round((total - available) * 100.0 / total, 1)
+
+    def read_disk(self):
+        """Disk (used_percent, free_percent) from a single statvfs call"""
+        st = os.statvfs(DISK_USAGE_PATH)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+
+        # psutil reports usage relative to space available to non-root users
+        usable = used + free
+        used_percent = round(used * 100.0 / usable, 1) if usable else 0.0
+        free_percent = round(free * 100.0 / total, 1) if total else 0
+        return used_percent, free_percent
@@ -2,8 +2,12 @@
 Rotary encoder handler using gpiozero (event-driven, no polling)
 """
 
+import threading
+import time
+from collections import deque
 from gpiozero import RotaryEncoder, Button
 from gpiozero.pins.rpigpio import RPiGPIOFactory
+from config import ROTARY_VELOCITY_WINDOW, ROTARY_ACCEL_CURVE
 
 
 class RotaryEncoderHandler:
@@ -14,15 +18,27 @@ class RotaryEncoderHandler:
     - GPIO 6  -> Push button (SW)
     - GPIO 25 -> A / CLK
     - GPIO 27 -> B / DT
+
+    Rotation edges only accumulate steps; a dispatch thread delivers them,
+    so a burst that arrives while callbacks run becomes one callback with
+    the summed step count.
     """
 
     def __init__(self, pin_push=25, pin_a=26, pin_b=16):
+        self.rotation_callbacks = []
+        self.button_callbacks = []
+
+        # Steps waiting for dispatch
+        self.cond = threading.Condition()
+        self.pending_steps = 0
+        self.pending_timestamp = None  # Edge time of the oldest pending step
+        self.last_position = 0
+        self.edge_times = deque()  # Recent detent times, for spin velocity
+        self.running = True
+
         try:
             factory = RPiGPIOFactory()
 
-            self.rotation_callbacks = []
-            self.button_callbacks = []
-
             # Create rotary encoder
             self.encoder = RotaryEncoder(
                 a=pin_a,
@@ -44,6 +60,8 @@ class RotaryEncoderHandler:
             self.encoder.when_rotated = self._handle_rotation
             self.button.when_pressed = self._handle_button
 
+            threading.Thread(target=self._dispatch_loop, daemon=True).start()
+
             print(f"[Rotary] Initialized (Push={pin_push}, A={pin_a}, B={pin_b})")
 
         except Exception as e:
@@ -57,29 +75,71 @@ class RotaryEncoderHandler:
 
     def _handle_rotation(self):
         """
-        Called automatically by gpiozero when rotated
+        Called automatically by gpiozero when rotated (accumulates only)
         """
-        delta = self.encoder.steps
-
-        # Determine direction
-        direction = 1 if delta > 0 else -1
-
-        # Reset steps so next event is clean
-        self.encoder.steps = 0
-
-        for callback in self.rotation_callbacks:
-            try:
-                callback(direction, 1)
-            except Exception as e:
-                print(f"[Rotary] Rotation callback error: {e}")
+        timestamp = time.monotonic()  # Edge time, for input latency
+
+        # Diff against the last position instead of resetting, so no steps are lost
+        position = self.encoder.steps
+        with self.cond:
+            delta = position - self.last_position
+            self.last_position = position
+            if delta == 0:
+                return
+
+            if self.pending_steps == 0:
+                self.pending_timestamp = timestamp
+            self.pending_steps += delta
+            for _ in range(min(abs(delta), 16)):
+                self.edge_times.append(timestamp)
+            self.cond.notify()
+
+    def _velocity(self, now):
+        """Detents per second over the velocity window (call with cond held)"""
+        while self.edge_times and now - self.edge_times[0] > ROTARY_VELOCITY_WINDOW:
+            self.edge_times.popleft()
+        return len(self.edge_times) / ROTARY_VELOCITY_WINDOW
+
+    @staticmethod
+    def accel_multiplier(velocity):
+        """Step multiplier for a spin speed in detents per second"""
+        multiplier = 1
+        for min_velocity, factor in ROTARY_ACCEL_CURVE:
+            if velocity >= min_velocity:
+                multiplier = factor
+        return multiplier
+
+    def _dispatch_loop(self):
+        """Deliver accumulated steps; edges arriving meanwhile coalesce into the next call"""
+        while True:
+            with self.cond:
+                while self.running and self.pending_steps == 0:
+                    self.cond.wait()
+                if not self.running:
+                    return
+
+                steps, self.pending_steps = self.pending_steps, 0
+                timestamp = self.pending_timestamp
+                velocity = self._velocity(time.monotonic())
+
+            direction = 1 if steps > 0 else -1
+            count = abs(steps)
+            accel_steps = count * self.accel_multiplier(velocity)
+
+            for callback in self.rotation_callbacks:
+                try:
+                    callback(direction, count, timestamp=timestamp, accel_steps=accel_steps)
+                except Exception as e:
+                    print(f"[Rotary] Rotation callback error: {e}")
 
     def _handle_button(self):
         """
         Called automatically when button pressed
         """
+        timestamp = time.monotonic()
         for callback in self.button_callbacks:
             try:
-                callback()
+                callback(timestamp=timestamp)
             except Exception as e:
                 print(f"[Rotary] Button callback error: {e}")
 
@@ -90,15 +150,18 @@ class RotaryEncoderHandler:
     def on_rotation(self, callback):
         """
         Register rotation callback:
-        callback(direction, steps)
+        callback(direction, steps, timestamp=..., accel_steps=...)
         direction: 1 (CW) or -1 (CCW)
+        steps: detents turned since the last callback
+        timestamp: time.monotonic() of the first of those detents
+        accel_steps: steps scaled by the spin-speed acceleration curve
         """
         self.rotation_callbacks.append(callback)
 
     def on_button_press(self, callback):
         """
         Register button press callback:
-        callback()
+        callback(timestamp=...)
         """
         self.button_callbacks.append(callback)
 
@@ -106,6 +169,9 @@ class RotaryEncoderHandler:
         """
         Clean up GPIO resources
         """
+        with self.cond:
+            self.running = False
+            self.cond.notify()
         try:
             if self.encoder:
                 self.encoder.close()
@@ -124,10 +190,10 @@ if __name__ == "__main__":
 
     rotary = RotaryEncoderHandler()
 
-    def on_rotate(direction, steps):
-        print(f"Rotated: {'Clockwise' if direction > 0 else 'Counter-clockwise'}")
+    def on_rotate(direction, steps, timestamp=None, accel_steps=None):
+        print(f"Rotated: {'Clockwise' if direction > 0 else 'Counter-clockwise'} x{steps} (accel {accel_steps})")
 
-    def on_button():
+    def on_button(timestamp=None):
         print("Button pressed!")
 
     rotary.on_rotation(on_rotate)
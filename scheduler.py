@@ -0,0 +1,122 @@
+"""Event-driven frame scheduling"""
+
+import threading
+import time
+from config import TAB_REFRESH_INTERVALS, ALARM_REFRESH_INTERVAL, FRAME_MIN_INTERVAL
+
+
+class FrameScheduler:
+    """
+    Decides when the next frame is drawn
+
+    A frame is due when something asks for one (encoder input, a new data
+    snapshot), when the wall clock crosses a minute boundary, when the
+    active tab's refresh interval elapses, or every second while the alarm
+    counts down. In between, the render loop sleeps on a condition
+    variable, so an idle device does no work and input is drawn at once.
+    """
+
+    def __init__(self, tab_intervals=None, min_interval=FRAME_MIN_INTERVAL):
+        """
+        Initialize scheduler
+
+        Args:
+            tab_intervals: Tab name -> seconds between redraws (None = events only)
+            min_interval: Minimum seconds between frames, bursts are coalesced
+        """
+        self.tab_intervals = TAB_REFRESH_INTERVALS if tab_intervals is None else tab_intervals
+        self.min_interval = min_interval
+        self.cond = threading.Condition()
+        self.pending = set()  # Reasons requested since the last frame
+        self.pending_timestamps = []  # Input edge times waiting for a frame
+        self.frame_timestamps = []  # Input edge times shown by the current frame
+
+        self.last_frame = 0.0  # time.monotonic() of the last frame
+        self.last_minute = None  # Wall clock minute of the last frame
+
+        self.frames = 0
+        self.reason_counts = {}
+
+    def request_render(self, reason="event", timestamp=None):
+        """
+        Ask for a frame as soon as possible (thread-safe)
+
+        Args:
+            reason: Why the frame is needed ("input" frames skip the rate limit)
+            timestamp: time.monotonic() of the triggering input edge, for latency
+        """
+        with self.cond:
+            self.pending.add(reason)
+            if timestamp is not None:
+                self.pending_timestamps.append(timestamp)
+            self.cond.notify()
+
+    def _interval(self, tab, alarm_active):
+        """Periodic redraw interval for the current screen, None if event-driven"""
+        if alarm_active:
+            return ALARM_REFRESH_INTERVAL
+        return self.tab_intervals.get(tab)
+
+    def _due(self, now, tab, alarm_active):
+        """Reasons the next frame is due at monotonic time `now`"""
+        due = set(self.pending)
+        if self.last_minute != int(time.time() // 60):
+            due.add("minute")
+        interval = self._interval(tab, alarm_active)
+        if interval is not None and now - self.last_frame >= interval:
+            due.add("alarm" if alarm_active else "refresh")
+        return due
+
+    def _timeout(self, now, tab, alarm_active):
+        """Seconds until the next time-based frame"""
+        # Small margin so the wake-up lands after the boundary, not just before
+        timeout = 60 - time.time() % 60 + 0.01
+        interval = self._interval(tab, alarm_active)
+        if interval is not None:
+            timeout = min(timeout, self.last_frame + interval - now)
+        return max(0.0, timeout)
+
+    def wait_for_frame(self, tab, alarm_active=False):
+        """
+        Block until the next frame is due
+
+        Args:
+            tab: Active tab name
+            alarm_active: True while the alarm takeover is shown
+
+        Returns:
+            Set of reasons for this frame ("minute", "refresh", "alarm"
+            and any requested reasons). Input timestamps covered by the
+            frame are left in frame_timestamps.
+        """
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                due = self._due(now, tab, alarm_active)
+                if not due:
+                    self.cond.wait(self._timeout(now, tab, alarm_active))
+                    continue
+
+                # Input jumps the rate limit, everything else is coalesced
+                wait = self.last_frame + self.min_interval - now
+                if wait > 0 and "input" not in due:
+                    self.cond.wait(wait)
+                    continue
+
+                self.pending.clear()
+                self.frame_timestamps = self.pending_timestamps
+                self.pending_timestamps = []
+                self.last_frame = now
+                self.last_minute = int(time.time() // 60)
+                self.frames += 1
+                for reason in due:
+                    self.reason_counts[reason] = self.reason_counts.get(reason, 0) + 1
+                return due
+
+    def get_stats(self):
+        """Get frame counts by reason"""
+        with self.cond:
+            return {
+                "frames": self.frames,
+                "reasons": dict(self.reason_counts),
+            }
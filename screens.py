@@ -0,0 +1,297 @@
+"""Screen layouts and shared value helpers for the OLED tabs"""
+
+from widgets import Screen, Label, ProgressBar, Divider, StatusBar, render_background
+from config import DISPLAY_WIDTH, DISPLAY_HEIGHT
+
+# Settings menu labels, in the order shown on screen
+SETTINGS_MENU_LABELS = [
+    "Brightness",
+    "Contrast",
+    "Wake Time",
+    "Temp Unit",
+    "Favorites"
+]
+
+
+# ==============================
+# Value helpers
+# ==============================
+
+def battery_percent(stats):
+    """Simulated battery percentage from system uptime"""
+    uptime_hours = stats.get('uptime_hours', 0)
+    return max(5, 100 - (uptime_hours % 48) * 2)  # Simulate battery drain
+
+
+def signal_quality(dbm):
+    """Map dBm to (signal bars, quality label)"""
+    if dbm > -50:
+        return "████", "Excellent"
+    elif dbm > -70:
+        return "███░", "Good"
+    elif dbm > -85:
+        return "██░░", "Fair"
+    return "█░░░", "Weak"
+
+
+def status_values(data):
+    """(signal_dbm, battery_percent, is_connected) for the status bar"""
+    signal_dbm = data.get("signal", {}).get("dbm") or -100
+    return signal_dbm, battery_percent(data.get("stats", {})), signal_dbm > -100
+
+
+def settings_values(data):
+    """Settings screen data from the frame data"""
+    menu_state = data.get("menu_state", {})
+    return {
+        "mode": menu_state.get("mode", "view"),
+        "menu_index": menu_state.get("menu_index", 0),
+        "menu_item": menu_state.get("menu_item"),
+        "edit_value": menu_state.get("edit_value"),
+        "brightness": data.get("brightness", 5),
+        "contrast": data.get("contrast", 55),
+        "wake_time": data.get("wake_time", "07:30")
+    }
+
+
+def wake_values(data):
+    """Timer screen data from the frame data"""
+    return {
+        'active': data.get("wake_active", False),
+        'remaining': data.get("remaining_time", 0),
+        'time': data.get("wake_time", "07:30")
+    }
+
+
+def next_hours_text(hours):
+    """Compact hourly forecast strip, e.g. 15h12° 16h13° 17h11°"""
+    return " ".join(
+        f"{hour['hour']:02d}h{hour['temp']}°" for hour in hours if hour.get("temp") is not None
+    )
+
+
+def screen_key(data):
+    """Pick the layout for the current frame"""
+    if data.get("wake_active"):
+        return "alarm"
+
+    active_tab = data.get("active_tab", "home")
+    if active_tab == "weather" and not data.get("weather", {}).get("updated"):
+        return "weather_loading"
+    if active_tab == "settings":
+        return "settings_" + settings_values(data)["mode"]
+    if active_tab in SCREEN_BUILDERS:
+        return active_tab
+    return "about"
+
+
+# ==============================
+# Layouts
+# ==============================
+
+def _stats(data):
+    return data.get("stats", {})
+
+
+def _weather(data):
+    return data.get("weather", {})
+
+
+def _edit_item(data):
+    item = settings_values(data)["menu_item"] or {}
+    return item if isinstance(item, dict) else {}
+
+
+def _menu_row(row):
+    """Bind for one of the three visible settings menu rows"""
+    def bind(data):
+        menu_idx = settings_values(data)["menu_index"] or 0
+        idx = (max(0, menu_idx - 1) + row) % len(SETTINGS_MENU_LABELS)
+        prefix = "► " if idx == menu_idx else "  "
+        return prefix + SETTINGS_MENU_LABELS[idx]
+    return bind
+
+
+def _header(text):
+    return [Label(10, x=2, text=text), Divider(20)]
+
+
+def _build_home():
+    return [
+        Label(14, centered=True, bind=lambda d: d["now"].strftime("%H:%M")),
+        Label(28, centered=True, bind=lambda d: d["now"].strftime("%a, %d %b")),
+        Divider(38),
+        Label(44, centered=True, bind=lambda d: (
+            f"T:{_stats(d).get('cpu_temp', '?')}° M:{_stats(d).get('memory_usage', '?')}%"
+        )),
+        Label(54, centered=True, bind=lambda d: f"Up: {_stats(d).get('uptime', '?')}"),
+    ]
+
+
+def _build_system():
+    widgets = _header("● SYSTEM")
+    rows = [("CPU:{}°C", "cpu_temp"), ("RAM:{}%", "memory_usage"), ("DSK:{}%", "disk_usage")]
+    y = 22
+    for fmt, key in rows:
+        widgets.append(Label(y, x=2, bind=lambda d, fmt=fmt, key=key: fmt.format(_stats(d).get(key, 0))))
+        widgets.append(ProgressBar(
+            70, y + 2, 55, 3, static_outline=True,
+            bind=lambda d, key=key: (_stats(d).get(key, 0), 0, 100)
+        ))
+        y += 11
+    return widgets
+
+
+def _weather_header():
+    """Weather title with the location position when several are configured"""
+    def title(data):
+        count = _weather(data).get("location_count", 1)
+        if count > 1:
+            return f"☁ WEATHER {_weather(data).get('location_index', 0) + 1}/{count}"
+        return "☁ WEATHER"
+    return [Label(10, x=2, bind=title), Divider(20)]
+
+
+def _build_weather():
+    return _weather_header() + [
+        Label(24, centered=True, bind=lambda d: str(_weather(d).get("city", "Unknown"))[:14]),
+        Label(32, centered=True, bind=lambda d: (
+            f"{_weather(d).get('temp', 'N/A')}°C {_weather(d).get('humidity', 'N/A')}%"
+            f" {_weather(d).get('wind_speed', 'N/A')}m/s" + (" old" if _weather(d).get("stale") else "")
+        )),
+        Divider(45),
+        Label(48, centered=True, bind=lambda d: str(_weather(d).get("condition", "N/A"))[:13]),
+        Label(57, centered=True, bind=lambda d: next_hours_text(_weather(d).get("next_hours", []))),
+    ]
+
+
+def _build_weather_loading():
+    return _weather_header() + [
+        Label(28, centered=True, text="Loading..."),
+        Label(40, centered=True, bind=lambda d: str(_weather(d).get("city", ""))[:14]),
+    ]
+
+
+def _build_network():
+    def dbm(d):
+        return d.get("signal", {}).get("dbm") or -100
+
+    return _header("📶 NETWORK") + [
+        Label(24, centered=True, bind=lambda d: str(d.get("signal", {}).get("ssid", "No WiFi"))[:16]),
+        Label(33, centered=True, bind=lambda d: signal_quality(dbm(d))[0]),
+        Label(42, centered=True, bind=lambda d: signal_quality(dbm(d))[1]),
+        Divider(50),
+        Label(54, centered=True, bind=lambda d: str(d.get("ip_status", "N/A"))[:13]),
+    ]
+
+
+def _build_power():
+    return _header("🔋 POWER") + [
+        Label(24, centered=True, bind=lambda d: f"Battery: {battery_percent(_stats(d))}%"),
+        ProgressBar(15, 32, 98, 6, static_outline=True,
+                    bind=lambda d: (battery_percent(_stats(d)), 0, 100)),
+        Label(42, centered=True, bind=lambda d: f"Uptime: {_stats(d).get('uptime', '?')}"),
+        Label(54, centered=True, bind=lambda d: (
+            "Charging" if battery_percent(_stats(d)) > 20 else "Low Battery!"
+        )),
+    ]
+
+
+def _build_timer():
+    return _header("⏱ TIMER") + [
+        Label(24, centered=True, text="Next Alarm"),
+        Label(34, centered=True, bind=lambda d: wake_values(d)["time"]),
+        Divider(46),
+        Label(54, centered=True, text="Alarm Armed"),
+    ]
+
+
+def _build_alarm():
+    return _header("⏱ TIMER") + [
+        Label(22, centered=True, text="⏰ ALARM!"),
+        Label(36, centered=True, bind=lambda d: f"{wake_values(d)['remaining']}s"),
+        Divider(50),
+        Label(56, centered=True, text="Press to Stop"),
+    ]
+
+
+def _build_settings_view():
+    return _header("⚙ SETTINGS") + [
+        Label(24, x=2, bind=lambda d: f"Brightness: {settings_values(d)['brightness']}/10"),
+        Label(34, x=2, bind=lambda d: f"Contrast: {settings_values(d)['contrast']}%"),
+        Label(44, x=2, bind=lambda d: f"Wake: {settings_values(d)['wake_time']}"),
+        Divider(52),
+        Label(56, centered=True, text="Press Button"),
+    ]
+
+
+def _build_settings_menu():
+    return _header("⚙ SETTINGS") + [
+        Label(24, x=4, bind=_menu_row(0)),
+        Label(35, x=4, bind=_menu_row(1)),
+        Label(46, x=4, bind=_menu_row(2)),
+        Divider(52),
+        Label(56, centered=True, text="↕ Rotate | Press Select"),
+    ]
+
+
+def _build_settings_edit():
+    def is_slider(d):
+        return _edit_item(d).get("type") == "slider"
+
+    def value(d):
+        return settings_values(d)["edit_value"]
+
+    return _header("⚙ SETTINGS") + [
+        Label(22, centered=True, bind=lambda d: _edit_item(d).get("label", "Unknown")),
+        Divider(32),
+        ProgressBar(10, 38, 108, 5, bind=lambda d: (
+            (value(d), _edit_item(d).get("min", 0), _edit_item(d).get("max", 100))
+            if is_slider(d) else None
+        )),
+        Label(48, centered=True, bind=lambda d: str(value(d)) if is_slider(d) else None),
+        Label(42, centered=True, bind=lambda d: None if is_slider(d) else str(value(d))),
+        Divider(52),
+        Label(56, centered=True, text="Press to Save"),
+    ]
+
+
+def _build_about():
+    return _header("ℹ ABOUT") + [
+        Label(26, centered=True, text="OLED Monitor"),
+        Label(36, centered=True, text="v3.0 Mobile UI"),
+        Divider(46),
+        Label(52, centered=True, text="Rotary: GPIO 6/25/27"),
+        Label(60, centered=True, text="Press for more info"),
+    ]
+
+
+SCREEN_BUILDERS = {
+    "home": _build_home,
+    "system": _build_system,
+    "weather": _build_weather,
+    "weather_loading": _build_weather_loading,
+    "network": _build_network,
+    "power": _build_power,
+    "timer": _build_timer,
+    "alarm": _build_alarm,
+    "settings_view": _build_settings_view,
+    "settings_menu": _build_settings_menu,
+    "settings_edit": _build_settings_edit,
+    "about": _build_about,
+}
+
+
+def build_widgets(key):
+    """Build the widget tree for a layout key"""
+    return [StatusBar(bind=status_values)] + SCREEN_BUILDERS[key]()
+
+
+def build_layer(key, renderer, mode="1"):
+    """Render the static background layer (headers, dividers, footers, bar outlines)"""
+    return render_background(build_widgets(key), renderer, (DISPLAY_WIDTH, DISPLAY_HEIGHT), mode)
+
+
+def build_screen(key, background):
+    """Build the retained screen for a layout key on top of its background layer"""
+    return Screen(build_widgets(key), background)
@@ -2,11 +2,47 @@
 
 import json
 import os
+import threading
+import time
 from pathlib import Path
+from config import SETTINGS_SAVE_DELAY, SETTINGS_SAVE_MAX_DELAY
+from wake_timer import parse_alarm_time
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _valid_alarm(alarm):
+    """{"time": "HH:MM", "days": [0-6], "enabled": bool}"""
+    if not isinstance(alarm, dict) or parse_alarm_time(alarm.get("time")) is None:
+        return False
+    days = alarm.get("days", [])
+    return (isinstance(days, list)
+            and all(isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in days)
+            and isinstance(alarm.get("enabled", True), bool))
+
+
+def _valid_site(site):
+    """{"name": str, "lat": -90..90, "lon": -180..180}"""
+    return (isinstance(site, dict)
+            and _is_number(site.get("lat")) and -90 <= site["lat"] <= 90
+            and _is_number(site.get("lon")) and -180 <= site["lon"] <= 180
+            and isinstance(site.get("name", ""), str))
 
 
 class SettingsManager:
-    """Manages application settings with JSON persistence"""
+    """
+    Manages application settings with JSON persistence
+    
+    In write-behind mode, changes only mark the settings dirty. A writer
+    thread saves them once they have been quiet for SETTINGS_SAVE_DELAY
+    (or at most SETTINGS_SAVE_MAX_DELAY after the first change), so a burst
+    of changes costs one write. Files are replaced atomically.
+    
+    Consumers subscribe to keys instead of polling; every change bumps
+    `version`, so a reader can tell cheaply whether anything changed.
+    """
     
     # Default settings path
     SETTINGS_FILE = "/home/biu/settings.json"
@@ -18,15 +54,52 @@ class SettingsManager:
         "favorites": [],           # List of favorite tab names
         "last_tab": "home",        # Last active tab (new home screen)
         "wake_time": "07:30",      # Wake alarm time (HH:MM)
+        "alarms": [],              # [{"time": "HH:MM", "days": [0-6, Mon=0], "enabled": true}]
         "temperature_unit": "C",   # C or F
         "wifi_enabled": True,
-        "weather_enabled": True
+        "weather_enabled": True,
+        "weather_locations": []    # Extra weather sites: [{"name": "HQ", "lat": 52.52, "lon": 13.41}]
+    }
+    
+    # Value checks beyond the type, applied to settings read from disk
+    RANGES = {
+        "brightness": (1, 10),
+        "contrast": (0, 100)
+    }
+    CHOICES = {
+        "temperature_unit": ("C", "F")
+    }
+    ITEM_CHECKS = {  # list settings: per-entry validator
+        "alarms": _valid_alarm,
+        "weather_locations": _valid_site
     }
     
-    def __init__(self, settings_file=None):
-        """Initialize settings manager"""
+    def __init__(self, settings_file=None, write_behind=True):
+        """
+        Initialize settings manager
+        
+        Args:
+            settings_file: JSON file path (default SETTINGS_FILE)
+            write_behind: Batch changes and save from a background thread
+        """
         self.settings_file = settings_file or self.SETTINGS_FILE
         self.settings = self.DEFAULTS.copy()
+        self.write_behind = write_behind
+        
+        # Write-behind state
+        self.cond = threading.Condition(threading.RLock())
+        self.dirty = False
+        self.first_change = 0.0
+        self.last_change = 0.0
+        self.last_written = None  # Serialized content of the last write
+        self.write_lock = threading.RLock()  # One writer at a time: serialize, write, last_written
+        self.writer = None
+        self.writes = 0
+        
+        # Change notification
+        self.version = 0
+        self.subscribers = {}  # key (None = any key) -> [callback]
+        
         self.load()
     
     def load(self):
@@ -34,9 +107,11 @@ class SettingsManager:
         try:
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r') as f:
-                    loaded = json.load(f)
+                    content = f.read()
+                    loaded = self._validate(json.loads(content))
                     # Merge with defaults (keeps new defaults if file is old)
                     self.settings = {**self.DEFAULTS, **loaded}
+                    self.last_written = content
                     print(f"Settings loaded from {self.settings_file}")
             else:
                 print(f"Settings file not found, using defaults")
@@ -45,17 +120,230 @@ class SettingsManager:
             print(f"Error loading settings: {e}")
             self.settings = self.DEFAULTS.copy()
     
+    def _validate(self, loaded):
+        """
+        Check settings read from disk against the defaults' types and
+        the allowed ranges
+        
+        Returns:
+            Dict of acceptable values (invalid keys, and invalid entries of
+            list settings, are dropped with a message)
+        """
+        if not isinstance(loaded, dict):
+            raise ValueError("settings file must contain a JSON object")
+        
+        valid = {}
+        for key, value in loaded.items():
+            default = self.DEFAULTS.get(key)
+            if default is not None:
+                expected = (int, float) if type(default) in (int, float) else type(default)
+                if isinstance(value, bool) != isinstance(default, bool) or not isinstance(value, expected):
+                    print(f"Ignoring setting {key}: expected {type(default).__name__}, got {value!r}")
+                    continue
+            
+            if key in self.RANGES:
+                low, high = self.RANGES[key]
+                if not low <= value <= high:
+                    print(f"Ignoring setting {key}: {value!r} outside {low}-{high}")
+                    continue
+            if key in self.CHOICES and value not in self.CHOICES[key]:
+                print(f"Ignoring setting {key}: {value!r} not one of {self.CHOICES[key]}")
+                continue
+            if key == "wake_time" and parse_alarm_time(value) is None:
+                print(f"Ignoring setting {key}: {value!r} is not HH:MM")
+                continue
+            if key in self.ITEM_CHECKS:
+                entries = [entry for entry in value if self.ITEM_CHECKS[key](entry)]
+                for entry in value:
+                    if entry not in entries:
+                        print(f"Ignoring {key} entry {entry!r}")
+                value = entries
+            
+            valid[key] = value
+        return valid
+    
+    def reload(self, path=None):
+        """
+        Re-read the settings file after an external edit and apply it live
+        
+        Our own saves are recognised by content and ignored. Subscribers
+        see the changed keys; nothing is written back.
+        """
+        try:
+            # Not mid-write, so last_written matches what is on disk
+            with self.write_lock:
+                with open(self.settings_file, 'r') as f:
+                    content = f.read()
+                if content == self.last_written:
+                    return  # Our own write
+            loaded = self._validate(json.loads(content))
+        except Exception as e:
+            print(f"Error reloading settings: {e}")
+            return
+        
+        with self.cond:
+            changed = [
+                key for key, value in loaded.items()
+                if key not in self.settings or self.settings[key] != value
+            ]
+            self.settings.update(loaded)
+            self.last_written = content
+        
+        if changed:
+            print(f"Settings reloaded from {self.settings_file}: {', '.join(changed)}")
+            self._notify(changed)
+    
+    def _serialize(self):
+        """Settings as the JSON text written to disk"""
+        with self.cond:
+            return json.dumps(self.settings, indent=2)
+    
+    def _write(self, content):
+        """Atomically replace the settings file (temp file, fsync, rename)"""
+        directory = os.path.dirname(self.settings_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        
+        tmp_file = self.settings_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.settings_file)
+        
+        # Persist the rename itself
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+        
+        self.last_written = content
+        self.writes += 1
+    
     def save(self):
-        """Save settings to JSON file"""
+        """
+        Save settings to JSON file now (skipped if the file is already current)
+        
+        Returns:
+            True if the file holds the snapshot, False if the write failed
+            (pending changes then stay dirty and are retried)
+        """
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
-            
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-            print(f"Settings saved to {self.settings_file}")
+            # Held from snapshot to rename, so an older snapshot can never
+            # replace a newer one and writers never share the temp file
+            with self.write_lock:
+                with self.cond:
+                    content = self._serialize()
+                    changed_at = self.last_change
+                if content != self.last_written:
+                    self._write(content)
+                    print(f"Settings saved to {self.settings_file}")
+                with self.cond:
+                    # Changes made while writing still need a write of their own
+                    if self.last_change == changed_at:
+                        self.dirty = False
+            return True
         except Exception as e:
             print(f"Error saving settings: {e}")
+            return False
+    
+    def subscribe(self, key, callback):
+        """
+        Register a change callback:
+        callback(key, value)
+        
+        Args:
+            key: Setting to watch, None for every setting
+            callback: Called on the thread that made the change
+        """
+        with self.cond:
+            self.subscribers.setdefault(key, []).append(callback)
+    
+    def unsubscribe(self, key, callback):
+        """Remove a change callback"""
+        with self.cond:
+            callbacks = self.subscribers.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+    
+    def _apply(self, updates):
+        """Merge updates into the settings, then notify and persist what changed"""
+        with self.cond:
+            changed = [
+                key for key, value in updates.items()
+                if key not in self.settings or self.settings[key] != value
+            ]
+            self.settings.update(updates)
+        self._changed(changed)
+    
+    def _notify(self, keys):
+        """Bump the version and call subscribers for the changed keys"""
+        with self.cond:
+            self.version += 1
+            calls = [
+                (callback, key, self.settings.get(key))
+                for key in keys
+                for callback in self.subscribers.get(key, []) + self.subscribers.get(None, [])
+            ]
+        for callback, key, value in calls:
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"Settings subscriber error ({key}): {e}")
+    
+    def _changed(self, keys):
+        """Notify subscribers and persist a change, now or after the write-behind delay"""
+        if not keys:
+            return
+        self._notify(keys)
+        
+        if not self.write_behind:
+            self.save()
+            return
+        
+        with self.cond:
+            now = time.monotonic()
+            if not self.dirty:
+                self.dirty = True
+                self.first_change = now
+            self.last_change = now
+            if self.writer is None:
+                self.writer = threading.Thread(target=self._writer_loop, daemon=True)
+                self.writer.start()
+            self.cond.notify()
+    
+    def _writer_loop(self):
+        """Save dirty settings once changes have settled"""
+        while True:
+            with self.cond:
+                while not self.dirty:
+                    self.cond.wait()
+                
+                # Debounce: every new change pushes the write back, up to the max delay
+                while self.dirty:
+                    deadline = min(
+                        self.last_change + SETTINGS_SAVE_DELAY,
+                        self.first_change + SETTINGS_SAVE_MAX_DELAY
+                    )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+            
+            if not self.save():
+                time.sleep(SETTINGS_SAVE_DELAY)  # Still dirty: retry after a pause
+    
+    def flush(self):
+        """Write pending changes immediately (call on shutdown)"""
+        # Waits for a write already in progress instead of racing it
+        with self.write_lock:
+            with self.cond:
+                dirty = self.dirty
+            if dirty:
+                self.save()
     
     def get(self, key, default=None):
         """Get a setting value"""
@@ -63,30 +351,31 @@ class SettingsManager:
     
     def set(self, key, value):
         """Set a setting value and save"""
-        self.settings[key] = value
-        self.save()
+        self._apply({key: value})
     
     def update(self, updates):
         """Update multiple settings at once"""
-        self.settings.update(updates)
-        self.save()
+        self._apply(updates)
     
     def get_all(self):
         """Get all settings"""
-        return self.settings.copy()
+        with self.cond:
+            return self.settings.copy()
     
     def reset_to_defaults(self):
         """Reset all settings to defaults"""
-        self.settings = self.DEFAULTS.copy()
-        self.save()
+        with self.cond:
+            old = self.settings
+            self.settings = self.DEFAULTS.copy()
+            changed = [key for key in old.keys() | self.settings.keys()
+                       if old.get(key) != self.settings.get(key)]
+        self._changed(changed)
     
     def set_brightness(self, level):
         """Set brightness level (1-10) and corresponding contrast"""
         level = max(1, min(10, level))  # Clamp to 1-10
         contrast = 10 + (level - 1) * 10  # Map 1-10 to 10-100
-        self.settings["brightness"] = level
-        self.settings["contrast"] = contrast
-        self.save()
+        self._apply({"brightness": level, "contrast": contrast})
     
     def get_brightness(self):
         """Get brightness level (1-10)"""
@@ -98,15 +387,15 @@ class SettingsManager:
     
     def add_favorite(self, tab_name):
         """Add tab to favorites"""
-        if tab_name not in self.settings["favorites"]:
-            self.settings["favorites"].append(tab_name)
-            self.save()
+        favorites = self.get_favorites()
+        if tab_name not in favorites:
+            self._apply({"favorites": favorites + [tab_name]})
     
     def remove_favorite(self, tab_name):
         """Remove tab from favorites"""
-        if tab_name in self.settings["favorites"]:
-            self.settings["favorites"].remove(tab_name)
-            self.save()
+        favorites = self.get_favorites()
+        if tab_name in favorites:
+            self._apply({"favorites": [name for name in favorites if name != tab_name]})
     
     def is_favorite(self, tab_name):
         """Check if tab is in favorites"""
@@ -118,8 +407,7 @@ class SettingsManager:
     
     def set_last_tab(self, tab_name):
         """Set last active tab"""
-        self.settings["last_tab"] = tab_name
-        self.save()
+        self._apply({"last_tab": tab_name})
     
     def get_last_tab(self):
         """Get last active tab"""
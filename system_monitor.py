@@ -3,97 +3,274 @@
 import subprocess
 import psutil
 import json
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from config import CPU_SAMPLE_WINDOW, STATS_REFRESH_INTERVALS
+from proc_reader import SystemReader, CPU_LINE
+
+
+class CpuSampler:
+    """Non-blocking CPU usage sampler based on /proc/stat jiffy deltas"""
+
+    def __init__(self, reader, window=CPU_SAMPLE_WINDOW):
+        """
+        Initialize sampler
+
+        Args:
+            reader: SystemReader used to read /proc/stat
+            window: Number of samples kept for the rolling average
+        """
+        self.reader = reader
+        self.prev_total = None
+        self.prev_cores = []
+        self.history = deque(maxlen=max(1, window))
+        self.last_total = None
+        self.last_cores = []
+        self.sample()  # Prime counters so the first real call has a delta
+
+    def _read_counters(self):
+        """Read (busy, total) jiffies for the whole CPU and each core"""
+        total = None
+        cores = []
+        data = self.reader.read_stat()
+        if not data:
+            return total, cores
+
+        pos = 0
+        # cpu lines come first; stop at the first other line (intr is huge)
+        while match := CPU_LINE.match(data, pos):
+            pos = match.end()
+            name, fields = match.groups()
+            values = [int(v) for v in fields.split()[:8]]
+            # idle + iowait count as idle time; guest is already in user
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            busy_total = sum(values)
+            counters = (busy_total - idle, busy_total)
+            if name == b"cpu":
+                total = counters
+            else:
+                cores.append(counters)
+        return total, cores
+
+    @staticmethod
+    def _percent(prev, cur):
+        """CPU percentage between two (busy, total) samples"""
+        busy = cur[0] - prev[0]
+        total = cur[1] - prev[1]
+        if total <= 0:
+            return 0.0
+        return round(max(0.0, min(100.0, busy * 100.0 / total)), 1)
+
+    def sample(self):
+        """Take a sample and return total CPU usage since the previous call"""
+        total, cores = self._read_counters()
+        if total is None:
+            return self.last_total
+
+        if self.prev_total is not None:
+            self.last_total = self._percent(self.prev_total, total)
+            self.last_cores = [
+                self._percent(prev, cur)
+                for prev, cur in zip(self.prev_cores, cores)
+            ]
+            self.history.append(self.last_total)
+
+        self.prev_total = total
+        self.prev_cores = cores
+        return self.last_total
+
+    def get_per_core(self):
+        """Per-core usage percentages from the latest sample"""
+        return list(self.last_cores)
+
+    def get_average(self):
+        """Rolling average of total usage over the sample window"""
+        if not self.history:
+            return self.last_total
+        return round(sum(self.history) / len(self.history), 1)
+
+
+class MetricRegistry:
+    """Serves each registered metric from a cache until its refresh interval expires"""
+
+    def __init__(self):
+        self.providers = {}
+        self.lock = threading.Lock()
+
+    def register(self, name, fetch, interval):
+        """
+        Register a metric provider
+
+        Args:
+            name: Metric name
+            fetch: Callable returning the fresh value
+            interval: Seconds a cached value is served before refetching
+        """
+        self.providers[name] = {
+            "fetch": fetch,
+            "interval": interval,
+            "value": None,
+            "updated_at": None,
+        }
+
+    def get(self, name, force=False):
+        """Get a metric value, refreshing it only when expired or forced"""
+        provider = self.providers[name]
+        with self.lock:
+            now = time.monotonic()
+            updated_at = provider["updated_at"]
+            if force or updated_at is None or now - updated_at >= provider["interval"]:
+                provider["value"] = provider["fetch"]()
+                provider["updated_at"] = now
+            return provider["value"]
+
+    def refresh(self, name=None):
+        """Force a refresh of one metric, or of all metrics if name is None"""
+        names = [name] if name else list(self.providers)
+        for metric in names:
+            self.get(metric, force=True)
+
+    def get_metadata(self):
+        """Age, interval and staleness of every cached metric"""
+        now = time.monotonic()
+        metadata = {}
+        for name, provider in self.providers.items():
+            updated_at = provider["updated_at"]
+            age = now - updated_at if updated_at is not None else None
+            metadata[name] = {
+                "age": round(age, 2) if age is not None else None,
+                "interval": provider["interval"],
+                "stale": age is None or age >= provider["interval"],
+            }
+        return metadata
+
+
+_reader = None
+_cpu_sampler = None
+_registry = None
+
+
+def get_reader():
+    """Get the shared SystemReader (sensors are probed on first use)"""
+    global _reader
+    if _reader is None:
+        _reader = SystemReader()
+    return _reader
+
+
+def get_cpu_sampler():
+    """Get the shared CPU sampler (created on first use)"""
+    global _cpu_sampler
+    if _cpu_sampler is None:
+        _cpu_sampler = CpuSampler(get_reader())
+    return _cpu_sampler
 
 
 def get_cpu_temperature():
     """Get CPU temperature in Celsius"""
     try:
-        with open("/sys/class/thermal/thermal_zone0/temp", "r") as f:
-            temp_raw = int(f.read().strip())
-            return round(temp_raw / 1000.0, 1)  # Convert millidegrees to degrees
+        return get_reader().read_cpu_temperature()
     except Exception as e:
         print(f"Error reading CPU temp: {e}")
         return None
 
 
 def get_cpu_usage():
-    """Get CPU usage percentage"""
+    """Get CPU usage percentage since the previous call (non-blocking)"""
     try:
-        return round(psutil.cpu_percent(interval=0.5), 1)
+        return get_cpu_sampler().sample()
     except Exception as e:
         print(f"Error reading CPU usage: {e}")
-        return None
+        try:
+            # psutil also diffs against its last call when interval is None
+            return round(psutil.cpu_percent(interval=None), 1)
+        except Exception:
+            return None
 
 
-def get_memory_usage():
-    """Get memory usage percentage"""
+def get_cpu_usage_per_core():
+    """Get per-core CPU usage percentages from the latest sample"""
     try:
-        return round(psutil.virtual_memory().percent, 1)
+        return get_cpu_sampler().get_per_core()
     except Exception as e:
-        print(f"Error reading memory usage: {e}")
-        return None
+        print(f"Error reading per-core CPU usage: {e}")
+        return []
 
 
-def get_disk_usage():
-    """Get disk usage percentage"""
+def get_cpu_usage_average():
+    """Get rolling average CPU usage over CPU_SAMPLE_WINDOW samples"""
     try:
-        return round(psutil.disk_usage("/").percent, 1)
+        return get_cpu_sampler().get_average()
     except Exception as e:
-        print(f"Error reading disk usage: {e}")
+        print(f"Error reading CPU average: {e}")
         return None
 
 
-def get_uptime():
-    """Get system uptime as formatted string"""
+def get_memory_usage():
+    """Get memory usage percentage"""
     try:
-        with open("/proc/uptime", "r") as f:
-            uptime_seconds = int(float(f.read().split()[0]))
-            hours = uptime_seconds // 3600
-            minutes = (uptime_seconds % 3600) // 60
-            return f"{hours}h {minutes}m"
+        percent = get_reader().read_memory_percent()
+        if percent is None:
+            percent = round(psutil.virtual_memory().percent, 1)
+        return percent
     except Exception as e:
-        print(f"Error reading uptime: {e}")
-        return "Unknown"
+        print(f"Error reading memory usage: {e}")
+        return None
 
 
-def get_uptime_hours():
-    """Get system uptime in hours as float"""
+def _read_disk():
+    """Read (used_percent, free_percent) for the root filesystem"""
     try:
-        with open("/proc/uptime", "r") as f:
-            uptime_seconds = float(f.read().split()[0])
-            return uptime_seconds / 3600.0
+        return get_reader().read_disk()
     except Exception as e:
-        print(f"Error reading uptime: {e}")
-        return 0.0
+        print(f"Error reading disk usage: {e}")
+        return None, 0
+
+
+def get_disk_usage():
+    """Get disk usage percentage"""
+    return _read_disk()[0]
 
 
 def get_disk_free_percent():
     """Get free disk space percentage"""
+    return _read_disk()[1]
+
+
+def _read_uptime_seconds():
+    """Read uptime in seconds, None on failure"""
     try:
-        total, used, free = psutil.disk_usage("/")
-        return round((free / total) * 100, 1)
+        return get_reader().read_uptime_seconds()
     except Exception as e:
-        print(f"Error reading disk free: {e}")
-        return 0
+        print(f"Error reading uptime: {e}")
+        return None
 
 
-def get_system_stats():
-    """Get all system statistics"""
-    return {
-        "cpu_temp": get_cpu_temperature(),
-        "cpu_usage": get_cpu_usage(),
-        "memory_usage": get_memory_usage(),
-        "disk_usage": get_disk_usage(),
-        "disk_free": get_disk_free_percent(),
-        "uptime": get_uptime(),
-        "uptime_hours": get_uptime_hours(),
-        "timestamp": datetime.now().isoformat()
-    }
+def _format_uptime(uptime_seconds):
+    """Format uptime seconds as '<h>h <m>m'"""
+    if uptime_seconds is None:
+        return "Unknown"
+    uptime_seconds = int(uptime_seconds)
+    hours = uptime_seconds // 3600
+    minutes = (uptime_seconds % 3600) // 60
+    return f"{hours}h {minutes}m"
+
+
+def get_uptime():
+    """Get system uptime as formatted string"""
+    return _format_uptime(_read_uptime_seconds())
+
+
+def get_uptime_hours():
+    """Get system uptime in hours as float"""
+    uptime_seconds = _read_uptime_seconds()
+    return uptime_seconds / 3600.0 if uptime_seconds is not None else 0.0
 
 
-def get_network_stats():
-    """Get network statistics"""
+def _read_network_stats():
+    """Read network counters"""
     try:
         net_io = psutil.net_io_counters()
         return {
@@ -105,3 +282,50 @@ def get_network_stats():
     except Exception as e:
         print(f"Error reading network stats: {e}")
         return None
+
+
+def get_registry():
+    """Get the shared metric registry (providers are registered on first use)"""
+    global _registry
+    if _registry is None:
+        intervals = STATS_REFRESH_INTERVALS
+        _registry = MetricRegistry()
+        _registry.register("cpu_temp", get_cpu_temperature, intervals["cpu_temp"])
+        _registry.register("cpu_usage", get_cpu_usage, intervals["cpu_usage"])
+        _registry.register("memory_usage", get_memory_usage, intervals["memory_usage"])
+        _registry.register("disk_usage", _read_disk, intervals["disk_usage"])
+        _registry.register("uptime", _read_uptime_seconds, intervals["uptime"])
+        _registry.register("network", _read_network_stats, intervals["network"])
+    return _registry
+
+
+def get_system_stats(force=False):
+    """Get all system statistics, served from the metric cache"""
+    registry = get_registry()
+    uptime_seconds = registry.get("uptime", force)
+    disk_usage, disk_free = registry.get("disk_usage", force)
+    return {
+        "cpu_temp": registry.get("cpu_temp", force),
+        "cpu_usage": registry.get("cpu_usage", force),
+        "memory_usage": registry.get("memory_usage", force),
+        "disk_usage": disk_usage,
+        "disk_free": disk_free,
+        "uptime": _format_uptime(uptime_seconds),
+        "uptime_hours": uptime_seconds / 3600.0 if uptime_seconds is not None else 0.0,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def get_network_stats(force=False):
+    """Get network statistics, served from the metric cache"""
+    return get_registry().get("network", force)
+
+
+def get_stats_metadata():
+    """Get age and staleness of every cached metric"""
+    return get_registry().get_metadata()
+
+
+def refresh_stats(name=None):
+    """Force a refresh of one metric, or all of them"""
+    get_registry().refresh(name)
@@ -0,0 +1,6 @@
+"""Make the application modules (kept flat in the repo root) importable"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
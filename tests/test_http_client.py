@@ -0,0 +1,177 @@
+"""HttpClient retries, conditional requests and circuit breaking"""
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+import http_client
+from http_client import HttpClient, HttpError, CircuitOpenError
+
+URL = "https://api.example.com/v1/forecast"
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=None, headers=None):
+        self.status_code = status
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSession:
+    """Replays queued responses (or exceptions) and records request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(dict(headers or {}))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture(autouse=True)
+def no_waiting(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(http_client, "HTTP_HOST_MIN_INTERVAL", {"default": 0})
+
+
+def _client(*responses):
+    client = HttpClient()
+    client.session = FakeSession(*responses)
+    return client
+
+
+def test_not_modified_reuses_cached_body():
+    client = _client(
+        FakeResponse(body={"t": 1}, headers={"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}),
+        FakeResponse(status=304),
+    )
+    assert client.get_json(URL, params={"a": 1}) == {"t": 1}
+    assert client.get_json(URL, params={"a": 1}) == {"t": 1}
+
+    first, second = client.session.calls
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"v1"'
+    assert second["If-Modified-Since"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+    stats = client.get_stats()["endpoints"]["api.example.com/v1/forecast"]
+    assert stats["requests"] == 2
+    assert stats["not_modified"] == 1
+
+
+def test_validators_are_per_query():
+    client = _client(
+        FakeResponse(body=1, headers={"ETag": '"a"'}),
+        FakeResponse(body=2),
+    )
+    client.get_json(URL, params={"lat": 1})
+    client.get_json(URL, params={"lat": 2})
+    assert "If-None-Match" not in client.session.calls[1]
+
+
+def test_transient_failure_is_retried():
+    client = _client(
+        requests.ConnectionError("reset"),
+        FakeResponse(status=503),
+        FakeResponse(body={"ok": True}),
+    )
+    assert client.get_json(URL) == {"ok": True}
+
+    stats = client.get_stats()
+    assert stats["endpoints"]["api.example.com/v1/forecast"]["errors"] == 2
+    assert stats["hosts"]["api.example.com"] == {"failures": 0, "circuit_open": False}
+
+
+def test_retries_exhausted_raises():
+    client = _client(*[FakeResponse(status=500)] * (http_client.HTTP_RETRIES + 1))
+    with pytest.raises(HttpError):
+        client.get_json(URL)
+    assert len(client.session.calls) == http_client.HTTP_RETRIES + 1
+
+
+def test_client_error_is_not_retried_and_keeps_circuit_closed():
+    client = _client(*[FakeResponse(status=404)] * (http_client.HTTP_BREAKER_THRESHOLD + 1))
+    for _ in range(http_client.HTTP_BREAKER_THRESHOLD):
+        with pytest.raises(HttpError) as error:
+            client.get_json(URL)
+        assert not isinstance(error.value, CircuitOpenError)
+    assert len(client.session.calls) == http_client.HTTP_BREAKER_THRESHOLD
+    assert client.get_stats()["hosts"]["api.example.com"]["circuit_open"] is False
+
+
+def test_circuit_opens_after_repeated_failures(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_RETRIES", 0)
+    threshold = http_client.HTTP_BREAKER_THRESHOLD
+    client = _client(*[requests.Timeout("slow")] * threshold)
+
+    for _ in range(threshold):
+        with pytest.raises(HttpError):
+            client.get_json(URL)
+    assert client.get_stats()["hosts"]["api.example.com"]["circuit_open"] is True
+
+    with pytest.raises(CircuitOpenError):
+        client.get_json(URL)
+    assert len(client.session.calls) == threshold  # Failed fast, no request
+
+
+def test_circuit_closes_after_cool_down(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_RETRIES", 0)
+    monkeypatch.setattr(http_client, "HTTP_BREAKER_BASE_DELAY", 0)
+    threshold = http_client.HTTP_BREAKER_THRESHOLD
+    client = _client(*[requests.Timeout("slow")] * threshold, FakeResponse(body="up"))
+
+    for _ in range(threshold):
+        with pytest.raises(HttpError):
+            client.get_json(URL)
+    assert client.get_json(URL) == "up"
+    assert client.get_stats()["hosts"]["api.example.com"] == {"failures": 0, "circuit_open": False}
+
+
+def test_jittered_stays_within_bounds():
+    for _ in range(100):
+        assert 5 <= http_client.jittered(10) <= 15
+
+
+def test_not_modified_without_cached_body_refetches():
+    client = _client(FakeResponse(status=304), FakeResponse(body={"t": 2}))
+    assert client.get_json(URL) == {"t": 2}
+
+    retry = client.session.calls[1]
+    assert retry["Cache-Control"] == "no-cache"
+    assert "If-None-Match" not in retry
+    assert client.get_stats()["hosts"]["api.example.com"]["failures"] == 0
+
+
+def test_repeated_bare_not_modified_keeps_circuit_closed():
+    client = _client(*[FakeResponse(status=304)] * 2 * http_client.HTTP_BREAKER_THRESHOLD)
+    for _ in range(http_client.HTTP_BREAKER_THRESHOLD):
+        with pytest.raises(HttpError) as error:
+            client.get_json(URL)
+        assert not isinstance(error.value, CircuitOpenError)
+    assert len(client.session.calls) == 2 * http_client.HTTP_BREAKER_THRESHOLD  # One refetch each
+    assert client.get_stats()["hosts"]["api.example.com"] == {"failures": 0, "circuit_open": False}
+
+
+def test_validators_are_bounded_lru(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_VALIDATOR_CACHE_SIZE", 2)
+    client = _client(
+        FakeResponse(body=0, headers={"ETag": '"0"'}),
+        FakeResponse(body=1, headers={"ETag": '"1"'}),
+        FakeResponse(status=304),
+        FakeResponse(body=2, headers={"ETag": '"2"'}),
+    )
+    client.get_json(URL, params={"n": 0})
+    client.get_json(URL, params={"n": 1})
+    assert client.get_json(URL, params={"n": 0}) == 0  # 304: n=0 becomes most recent
+    client.get_json(URL, params={"n": 2})  # Evicts n=1
+
+    assert [dict(key[1])["n"] for key in client.validators] == [0, 2]
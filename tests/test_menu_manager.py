@@ -0,0 +1,102 @@
+"""TabManager navigation"""
+
+import pytest
+
+from menu_manager import Mode, TabManager
+from settings_manager import SettingsManager
+
+
+@pytest.fixture
+def tabs(tmp_path):
+    settings = SettingsManager(settings_file=str(tmp_path / "settings.json"), write_behind=False)
+    return TabManager(settings)
+
+
+def _edit(tabs, item_name):
+    tabs.active_tab_index = next(t["index"] for t in TabManager.TABS if t["name"] == "settings")
+    tabs.enter_settings_menu()
+    tabs.menu_index = next(i for i, item in enumerate(TabManager.SETTINGS_ITEMS)
+                           if item["name"] == item_name)
+    tabs.enter_edit_mode()
+    assert tabs.current_mode == Mode.EDIT
+
+
+def test_tabs_move_by_raw_steps(tabs):
+    tabs.active_tab_index = 0
+    tabs.handle_rotation(1, steps=3, accel_steps=24)
+    assert tabs.active_tab_index == 3
+    tabs.handle_rotation(-1, steps=5, accel_steps=40)
+    assert tabs.active_tab_index == (3 - 5) % len(TabManager.TABS)
+
+
+def test_sliders_use_accelerated_steps(tabs):
+    _edit(tabs, "contrast")
+    start = tabs.edit_value
+    tabs.handle_rotation(-1, steps=2, accel_steps=16)
+    assert tabs.edit_value == max(0, start - 16)
+
+
+def test_slider_is_clamped(tabs):
+    _edit(tabs, "brightness")
+    tabs.handle_rotation(1, steps=5, accel_steps=40)
+    assert tabs.edit_value == 10
+
+
+def test_toggle_flips_only_on_odd_steps(tabs):
+    _edit(tabs, "favorites")
+    start = tabs.edit_value
+    tabs.handle_rotation(1, steps=2)
+    assert tabs.edit_value == start
+    tabs.handle_rotation(1, steps=3)
+    assert tabs.edit_value != start
+
+
+def test_events_apply_only_when_drained(tabs):
+    tabs.active_tab_index = 0
+    version = tabs.get_state()["version"]
+    tabs.post_event("rotate", 1, 1)
+    tabs.post_event("rotate", 1, 2)
+    assert tabs.active_tab_index == 0  # Queued, not applied
+
+    assert tabs.drain_events() == 2
+    assert tabs.active_tab_index == 3
+    state = tabs.get_state()
+    assert state["active_tab"] == TabManager.TABS[3]["name"]
+    assert state["version"] == version + 1  # One snapshot for the whole batch
+
+
+def test_full_queue_drops_oldest_events(tabs):
+    tabs.active_tab_index = 0
+    maxlen = tabs.events.maxlen
+    for _ in range(maxlen + 3):
+        tabs.post_event("rotate", 1, 1)
+    assert tabs.dropped_events == 3
+    assert tabs.drain_events() == maxlen
+
+
+def test_snapshot_is_read_only_and_stable(tabs):
+    state = tabs.get_state()
+    with pytest.raises(TypeError):
+        state["active_tab"] = "settings"
+
+    tabs.post_event("rotate", 1, 1)
+    tabs.drain_events()
+    assert tabs.get_state() is not state
+    assert state["version"] < tabs.get_state()["version"]
+
+
+def test_no_new_version_without_changes(tabs):
+    tabs.active_tab_index = 0
+    version = tabs.get_state()["version"]
+    tabs.post_event("rotate", 1, len(TabManager.TABS))  # Full turn lands on the same tab
+    tabs.drain_events()
+    assert tabs.get_state()["version"] == version
+
+
+def test_press_actions_reach_listeners(tabs):
+    actions = []
+    tabs.add_listener(actions.append)
+    tabs.active_tab_index = next(t["index"] for t in TabManager.TABS if t["name"] == "weather")
+    tabs.post_event("press")
+    tabs.drain_events()
+    assert actions == ["next_location"]
@@ -0,0 +1,81 @@
+"""PageCanvas must produce exactly the pixels ImageDraw would"""
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+np = pytest.importorskip("numpy")
+
+from page_canvas import PageCanvas  # noqa: E402
+
+WIDTH, HEIGHT = 128, 64
+
+PRIMITIVES = [
+    ("line", ((0, 0, 127, 0),), {"fill": 255}),
+    ("line", ((5, 63, 120, 63),), {"fill": 255}),
+    ("line", ((10, 3, 10, 60),), {"fill": 255}),
+    ("line", ((0, 0, 127, 63),), {"fill": 255}),
+    ("line", ((3, 5, 90, 5),), {"fill": 255, "width": 3}),
+    ("line", ((-10, 20, 200, 20),), {"fill": 255}),
+    ("rectangle", ((4, 4, 50, 30),), {"outline": 255}),
+    ("rectangle", ((4, 4, 50, 30),), {"fill": 255}),
+    ("rectangle", ((4, 4, 50, 30),), {"fill": 0, "outline": 255}),
+    ("rectangle", ((20, 10, 20, 10),), {"outline": 255}),
+    ("rectangle", ((0, 7, 127, 9),), {"fill": 255, "outline": 255}),
+    ("rectangle", ((2, 2, 60, 40),), {"outline": 255, "width": 2}),
+    ("ellipse", ((30, 10, 90, 50),), {"outline": 255}),
+    ("ellipse", ((30, 10, 90, 50),), {"fill": 255}),
+]
+
+
+def _pil_and_canvas():
+    base = Image.new("1", (WIDTH, HEIGHT))
+    ImageDraw.Draw(base).rectangle((40, 20, 100, 50), fill=255)  # Non-empty background
+    canvas = PageCanvas(WIDTH, HEIGHT)
+    canvas.paste(base)
+    return base.copy(), canvas
+
+
+@pytest.mark.parametrize("name, args, kwargs", PRIMITIVES)
+def test_primitive_matches_imagedraw(name, args, kwargs):
+    image, canvas = _pil_and_canvas()
+    getattr(ImageDraw.Draw(image), name)(*args, **kwargs)
+    getattr(canvas, name)(*args, **kwargs)
+    assert canvas.to_image().tobytes() == image.tobytes()
+
+
+@pytest.mark.parametrize("xy", [(0, 0), (17, 5), (120, 60), (-3, -4), (50, 30)])
+def test_bitmap_matches_imagedraw(xy):
+    mask = Image.new("1", (20, 11))
+    ImageDraw.Draw(mask).text((0, 0), "Ab9", font=ImageFont.load_default(), fill=255)
+    image, canvas = _pil_and_canvas()
+    ImageDraw.Draw(image).bitmap(xy, mask, fill=0)
+    canvas.bitmap(xy, mask, fill=0)
+    assert canvas.to_image().tobytes() == image.tobytes()
+
+
+def test_pages_are_sh1106_layout():
+    canvas = PageCanvas(WIDTH, HEIGHT)
+    canvas.line((3, 9, 3, 9), fill=255)  # Page 1, bit 1 of column 3
+    pages = canvas.to_pages()
+    assert len(pages) == HEIGHT // 8
+    assert pages[1][3] == 0b10
+    assert sum(map(sum, pages)) == 0b10
+
+
+def test_full_frames_match_pil_engine():
+    """Every benchmark screen draws identically on both engines"""
+    pytest.importorskip("luma.core")
+    from luma.core.device import dummy
+    from benchmark import SCENARIOS, make_frames
+    from display import DisplayManager
+
+    display_mgr = DisplayManager(device=dummy(width=WIDTH, height=HEIGHT, mode="1"),
+                                 threaded=False, retained=False, engine="numpy")
+    assert display_mgr.page_canvas is not None
+
+    for scenario in SCENARIOS:
+        for data in make_frames(scenario, 15):
+            image = Image.new("1", (WIDTH, HEIGHT))
+            display_mgr.draw_frame(image, data)
+            display_mgr.draw_frame(display_mgr.page_canvas, data)
+            assert display_mgr.page_canvas.to_image().tobytes() == image.tobytes(), scenario
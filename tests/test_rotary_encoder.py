@@ -0,0 +1,93 @@
+"""Encoder step accumulation and acceleration"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from config import ROTARY_ACCEL_CURVE, ROTARY_VELOCITY_WINDOW
+
+
+class Encoder:
+    """Stands in for the gpiozero RotaryEncoder position counter"""
+
+    def __init__(self, *args, **kwargs):
+        self.steps = 0
+
+
+class RPiGPIOFactory:
+    """Pin factory of a machine without GPIO"""
+
+    def __init__(self):
+        raise RuntimeError("no GPIO")
+
+
+@pytest.fixture
+def rotary(monkeypatch):
+    """rotary_encoder imported against stand-in gpiozero modules, so no Pi is needed"""
+    gpiozero = types.ModuleType("gpiozero")
+    gpiozero.RotaryEncoder = Encoder
+    gpiozero.Button = object
+    rpigpio = types.ModuleType("gpiozero.pins.rpigpio")
+    rpigpio.RPiGPIOFactory = RPiGPIOFactory
+    monkeypatch.setitem(sys.modules, "gpiozero", gpiozero)
+    monkeypatch.setitem(sys.modules, "gpiozero.pins", types.ModuleType("gpiozero.pins"))
+    monkeypatch.setitem(sys.modules, "gpiozero.pins.rpigpio", rpigpio)
+    monkeypatch.delitem(sys.modules, "rotary_encoder", raising=False)
+    return importlib.import_module("rotary_encoder")
+
+
+@pytest.fixture
+def handler(rotary):
+    # No GPIO: initialization fails and leaves the encoder unset
+    handler = rotary.RotaryEncoderHandler()
+    handler.encoder = Encoder()
+    yield handler
+    with handler.cond:
+        handler.running = False
+        handler.cond.notify_all()
+
+
+@pytest.mark.parametrize("velocity, expected", [
+    (0, 1), (9.9, 1), (10, 2), (25, 4), (40, 8), (400, 8),
+])
+def test_accel_multiplier_follows_curve(rotary, velocity, expected):
+    assert rotary.RotaryEncoderHandler.accel_multiplier(velocity) == expected
+
+
+def test_accel_curve_is_monotonic():
+    factors = [factor for _, factor in ROTARY_ACCEL_CURVE]
+    assert factors == sorted(factors)
+
+
+def test_velocity_counts_recent_edges_only(handler):
+    now = time.monotonic()
+    handler.edge_times.extend([now - ROTARY_VELOCITY_WINDOW * 2, now - 0.01, now])
+    with handler.cond:
+        assert handler._velocity(now) == pytest.approx(2 / ROTARY_VELOCITY_WINDOW)
+
+
+def test_edges_coalesce_without_losing_steps(handler):
+    for position in (1, 2, 3, 2, 5):
+        handler.encoder.steps = position
+        handler._handle_rotation()
+    assert handler.pending_steps == 5
+
+    calls = []
+    done = threading.Event()
+
+    def on_rotate(direction, count, timestamp=None, accel_steps=None):
+        calls.append((direction, count, accel_steps))
+        done.set()
+
+    handler.on_rotation(on_rotate)
+    threading.Thread(target=handler._dispatch_loop, daemon=True).start()
+    assert done.wait(1.0)
+
+    direction, count, accel_steps = calls[0]
+    assert (direction, count) == (1, 5)
+    assert accel_steps >= count  # Fast burst: possibly multiplied, never reduced
+    assert handler.pending_steps == 0
@@ -0,0 +1,207 @@
+"""SettingsManager persistence, notification and validation"""
+
+import errno
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import settings_manager
+from settings_manager import SettingsManager
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "settings.json")
+
+
+@pytest.fixture
+def fast_writes(monkeypatch):
+    monkeypatch.setattr(settings_manager, "SETTINGS_SAVE_DELAY", 0.05)
+    monkeypatch.setattr(settings_manager, "SETTINGS_SAVE_MAX_DELAY", 0.5)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_write_behind_batches_changes(path, fast_writes):
+    settings = SettingsManager(settings_file=path)
+    for level in range(1, 11):
+        settings.set_brightness(level)
+    assert settings.writes == 0  # Nothing written yet
+
+    assert _wait_for(lambda: settings.writes == 1)
+    time.sleep(0.1)
+    assert settings.writes == 1
+    with open(path) as f:
+        assert json.load(f)["brightness"] == 10
+
+
+def test_flush_writes_pending_changes(path):
+    settings = SettingsManager(settings_file=path)
+    settings.set("contrast", 80)
+    settings.flush()
+    with open(path) as f:
+        assert json.load(f)["contrast"] == 80
+
+
+def test_unchanged_settings_are_not_rewritten(path):
+    settings = SettingsManager(settings_file=path, write_behind=False)
+    settings.set("contrast", 70)
+    settings.set("contrast", 70)  # No change, no notification, no write
+    settings.save()
+    assert settings.writes == 1
+
+
+def test_atomic_replace_leaves_no_temp_file(path, tmp_path):
+    settings = SettingsManager(settings_file=path, write_behind=False)
+    settings.set("last_tab", "weather")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["settings.json"]
+
+
+def test_concurrent_saves_keep_the_latest_value(path):
+    settings = SettingsManager(settings_file=path)
+
+    def writer(offset):
+        for i in range(30):
+            settings.set("contrast", offset + i)
+            settings.save()
+
+    threads = [threading.Thread(target=writer, args=(n * 30,)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    settings.flush()
+
+    with open(path) as f:
+        assert json.load(f)["contrast"] == settings.get("contrast")
+
+
+@pytest.fixture
+def failing_replace(monkeypatch):
+    """Make the next os.replace fail like a full or read-only SD card"""
+    failures = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if not failures:
+            failures.append(dst)
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    return failures
+
+
+def test_failed_write_stays_dirty_for_flush(path, failing_replace):
+    settings = SettingsManager(settings_file=path)
+    settings.set("contrast", 80)
+    assert not settings.save()
+    assert failing_replace
+    assert settings.dirty
+
+    settings.flush()
+    with open(path) as f:
+        assert json.load(f)["contrast"] == 80
+    assert not settings.dirty
+
+
+def test_writer_retries_failed_write(path, fast_writes, failing_replace):
+    settings = SettingsManager(settings_file=path)
+    settings.set("contrast", 80)
+    assert _wait_for(lambda: settings.writes == 1)
+    assert failing_replace
+    with open(path) as f:
+        assert json.load(f)["contrast"] == 80
+
+
+def _validate(**values):
+    return SettingsManager(settings_file="/nonexistent/settings.json")._validate(values)
+
+
+@pytest.mark.parametrize("key, value", [
+    ("brightness", 0),
+    ("brightness", 11),
+    ("brightness", "5"),
+    ("brightness", True),
+    ("contrast", 101),
+    ("temperature_unit", "K"),
+    ("wake_time", "25:00"),
+    ("wake_time", None),
+    ("favorites", "home"),
+])
+def test_validate_rejects_bad_values(key, value):
+    assert _validate(**{key: value}) == {}
+
+
+def test_validate_keeps_good_values():
+    values = {"brightness": 10, "contrast": 0, "temperature_unit": "F", "wake_time": "06:45"}
+    assert _validate(**values) == values
+
+
+def test_validate_filters_list_entries():
+    good_alarm = {"time": "07:00", "days": [0, 1, 2], "enabled": True}
+    good_site = {"name": "HQ", "lat": 52.52, "lon": 13.41}
+    valid = _validate(
+        alarms=[good_alarm, {"time": "7am"}, {"time": "08:00", "days": [7]}],
+        weather_locations=[good_site, {"name": "Pole", "lat": 91, "lon": 0}, {"lat": "1", "lon": 2}],
+    )
+    assert valid == {"alarms": [good_alarm], "weather_locations": [good_site]}
+
+
+def test_validate_rejects_non_object():
+    settings = SettingsManager(settings_file="/nonexistent/settings.json")
+    with pytest.raises(ValueError):
+        settings._validate([1, 2])
+
+
+def test_reload_ignores_own_write(path):
+    settings = SettingsManager(settings_file=path, write_behind=False)
+    seen = []
+    settings.subscribe(None, lambda key, value: seen.append(key))
+    settings.set("contrast", 70)
+    version = settings.version
+
+    settings.reload()
+    assert settings.version == version
+    assert seen == ["contrast"]
+
+
+def _edit_file(path, **changes):
+    with open(path) as f:
+        data = json.load(f)
+    data.update(changes)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_reload_notifies_changed_keys_only(path):
+    settings = SettingsManager(settings_file=path, write_behind=False)
+    settings.save()
+    seen = []
+    settings.subscribe(None, lambda key, value: seen.append((key, value)))
+
+    _edit_file(path, contrast=30, temperature_unit="C")  # unit is unchanged
+    settings.reload()
+    assert seen == [("contrast", 30)]
+    assert settings.get("contrast") == 30
+    assert settings.writes == 1  # Nothing written back
+
+
+def test_reload_skips_invalid_values(path):
+    settings = SettingsManager(settings_file=path, write_behind=False)
+    settings.save()
+
+    _edit_file(path, brightness=99, contrast=40)
+    settings.reload()
+    assert settings.get("brightness") == SettingsManager.DEFAULTS["brightness"]
+    assert settings.get("contrast") == 40
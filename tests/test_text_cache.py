@@ -0,0 +1,44 @@
+"""TextCache LRU behaviour"""
+
+from PIL import ImageFont
+
+from text_cache import TextCache
+
+FONT = ImageFont.load_default()
+
+
+def test_hit_returns_cached_entry():
+    cache = TextCache(maxsize=4)
+    first = cache.get("12:34", FONT)
+    assert cache.get("12:34", FONT) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = TextCache(maxsize=2)
+    cache.get("a", FONT)
+    cache.get("b", FONT)
+    cache.get("a", FONT)  # "a" is now the most recent
+    cache.get("c", FONT)  # Evicts "b"
+
+    assert list(cache.entries) == [("a", FONT), ("c", FONT)]
+    cache.get("b", FONT)
+    assert cache.misses == 4
+
+
+def test_size_never_exceeds_maxsize():
+    cache = TextCache(maxsize=3)
+    for i in range(20):
+        cache.get(str(i), FONT)
+    assert cache.get_stats()["size"] == 3
+
+
+def test_text_without_ink_has_no_bitmap():
+    bitmap, _ = TextCache(maxsize=2).get(" ", FONT)
+    assert bitmap is None
+
+
+def test_bitmap_is_cropped_to_ink_box():
+    bitmap, bbox = TextCache(maxsize=2).get("X", FONT)
+    assert bitmap.mode == "1"
+    assert bitmap.size == (bbox[2] - bbox[0], bbox[3] - bbox[1])
@@ -0,0 +1,226 @@
+"""Forecast column lookups and multi-location WeatherManager fetches"""
+
+import threading
+import time
+
+import pytest
+
+import weather
+from settings_manager import SettingsManager
+from weather import Forecast, WeatherManager, LOCAL_KEY
+
+T0 = 1_790_000_000 - 1_790_000_000 % 86400  # Midnight UTC
+HOUR = 3600
+
+
+def _payload(start=T0, **hourly):
+    columns = {
+        "temperature_2m": [10.0, 12.0, 14.0, None],
+        "relative_humidity_2m": [80, 70, 60, 50],
+        "wind_speed_10m": [5.0, 5.0, 5.0, 5.0],
+        "precipitation": [0.0, 1.5, 0.2, None],
+        "weather_code": [1, 61, 3, None],
+    }
+    columns.update(hourly)
+    return {
+        "hourly": dict(columns, time=[start + i * HOUR for i in range(4)]),
+        "daily": {
+            "time": [start, start + 86400],
+            "temperature_2m_max": [15.0, None],
+            "temperature_2m_min": [8.0, 7.0],
+            "precipitation_sum": [1.7, 0.0],
+            "weather_code": [61, None],
+            "sunrise": [start + 7 * HOUR, start + 86400 + 7 * HOUR],
+            "sunset": [start + 18 * HOUR, start + 86400 + 18 * HOUR],
+        },
+    }
+
+
+@pytest.fixture
+def forecast():
+    return Forecast(_payload())
+
+
+def test_covers(forecast):
+    assert forecast.covers(T0)
+    assert forecast.covers(T0 + 3 * HOUR)
+    assert not forecast.covers(T0 - 1)
+    assert not forecast.covers(T0 + 3 * HOUR + 1)
+
+
+def test_instant_values_interpolate(forecast):
+    assert forecast.value_at("temperature_2m", T0) == 10.0
+    assert forecast.value_at("temperature_2m", T0 + HOUR // 4) == pytest.approx(10.5)
+    assert forecast.value_at("relative_humidity_2m", T0 + HOUR + HOUR // 2) == pytest.approx(65.0)
+
+
+def test_missing_neighbour_holds_last_value(forecast):
+    # Hour 3 is null, so the value of hour 2 is held rather than interpolated
+    assert forecast.value_at("temperature_2m", T0 + 2 * HOUR + HOUR // 2) == 14.0
+    assert forecast.value_at("temperature_2m", T0 + 3 * HOUR) is None
+
+
+def test_weather_code_holds_current_hour(forecast):
+    assert forecast.value_at("weather_code", T0 + HOUR - 1) == 1
+    assert forecast.value_at("weather_code", T0 + HOUR) == 61
+    assert forecast.value_at("weather_code", T0 + 3 * HOUR) is None
+
+
+def test_precipitation_is_the_hour_in_progress(forecast):
+    # Each value is the total of the hour ending at its timestamp
+    assert forecast.value_at("precipitation", T0 + 1) == pytest.approx(1.5)
+    assert forecast.value_at("precipitation", T0 + HOUR) == pytest.approx(1.5)
+    assert forecast.value_at("precipitation", T0 + HOUR + 1) == pytest.approx(0.2)
+    assert forecast.value_at("precipitation", T0 + 2 * HOUR + 1) is None
+
+
+def test_outside_data_is_none(forecast):
+    assert forecast.value_at("temperature_2m", T0 - HOUR) is None
+    assert forecast.value_at("weather_code", T0 + 4 * HOUR) is None
+
+
+def test_day_at(forecast):
+    today = forecast.day_at(T0 + 12 * HOUR)
+    assert today["temperature_2m_max"] == 15.0
+    assert today["sunrise"] == T0 + 7 * HOUR
+    tomorrow = forecast.day_at(T0 + 86400)
+    assert tomorrow["temperature_2m_max"] is None
+    assert tomorrow["weather_code"] is None
+    assert tomorrow["temperature_2m_min"] == 7.0
+
+
+def test_day_at_outside_data(forecast):
+    assert forecast.day_at(T0 - 1) is None
+    assert forecast.day_at(T0 + 2 * 86400) is None
+
+
+def test_hours_after(forecast):
+    assert list(forecast.hours_after(T0, 2)) == [1, 2]
+    assert list(forecast.hours_after(T0 + HOUR // 2, 5)) == [1, 2, 3]
+    assert list(forecast.hours_after(T0 + 3 * HOUR, 3)) == []
+
+
+def test_malformed_payload_raises():
+    with pytest.raises(KeyError):
+        Forecast({"hourly": {"time": []}})
+    with pytest.raises(TypeError):
+        Forecast(_payload(temperature_2m=["warm", 1, 2, 3]))
+
+
+# ---------------- WeatherManager ----------------
+
+SITES = [
+    {"name": "HQ", "lat": 52.52, "lon": 13.41},
+    {"name": "Lab", "lat": 48.14, "lon": 11.58},
+]
+
+
+class FakeHttp:
+    """Returns one payload per requested location, optionally running a hook mid-request"""
+
+    def __init__(self, during=None):
+        self.requests = []
+        self.during = during
+
+    def get_json(self, url, params=None, timeout=None):
+        self.requests.append(params)
+        if self.during:
+            self.during()
+        count = len(params["latitude"].split(","))
+        start = int(time.time()) - HOUR
+        payloads = [_payload(start) for _ in range(count)]
+        return payloads if count > 1 else payloads[0]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(weather, "WEATHER_CACHE_FILE", str(tmp_path / "weather.json"))
+    monkeypatch.setattr(weather, "LOCATION_CACHE_FILE", str(tmp_path / "location.json"))
+    settings = SettingsManager(settings_file=str(tmp_path / "settings.json"), write_behind=False)
+    settings.set("weather_locations", SITES)
+    mgr = WeatherManager(settings)
+    mgr._set_location({"lat": 40.71, "lon": -74.01, "city": "New York"})
+    mgr.http = FakeHttp()
+    return mgr
+
+
+def test_one_request_for_all_locations(manager):
+    assert manager.seconds_until_update() == 0
+    manager.fetch_weather()
+
+    assert len(manager.http.requests) == 1
+    params = manager.http.requests[0]
+    assert params["latitude"] == "40.71,52.52,48.14"
+    assert params["longitude"] == "-74.01,13.41,11.58"
+    assert set(manager.forecasts) == {LOCAL_KEY, "52.52,13.41", "48.14,11.58"}
+    assert manager.weather_data["city"] == "New York"
+    assert manager.weather_data["updated"]
+    assert manager.seconds_until_update() > 0
+
+
+def test_next_location_cycles(manager):
+    manager.fetch_weather()
+    cities = [manager.next_location()["city"] for _ in range(3)]
+    assert cities == ["HQ", "Lab", "New York"]
+    assert manager.next_location(-1)["location_index"] == 2
+
+
+def test_duplicate_sites_are_ignored(manager):
+    manager.settings_mgr.set("weather_locations", SITES + [{"name": "HQ again", "lat": 52.521, "lon": 13.409}])
+    assert [site["name"] for site in manager.sites] == ["HQ", "Lab"]
+    assert manager.wake.is_set()
+
+
+def test_new_site_makes_a_fetch_due(manager):
+    manager.fetch_weather()
+    manager.settings_mgr.set("weather_locations", SITES + [{"name": "Port", "lat": 53.55, "lon": 9.99}])
+    assert manager.seconds_until_update() == 0
+
+
+def test_location_moved_during_fetch_is_discarded(manager):
+    manager.http.during = lambda: manager._set_location({"lat": 51.51, "lon": -0.13, "city": "London"})
+    manager.fetch_weather()
+
+    assert LOCAL_KEY not in manager.forecasts
+    assert "52.52,13.41" in manager.forecasts
+    assert manager.weather_data["city"] == "London"
+    assert not manager.weather_data["updated"]
+    assert manager.seconds_until_update() == 0  # Refetch for the new place
+
+
+def test_failed_fetch_keeps_data_and_backs_off(manager):
+    manager.fetch_weather()
+    shown = manager.weather_data
+    manager.http.get_json = lambda *args, **kwargs: [_payload()]  # Wrong count
+
+    assert manager.fetch_weather() is None
+    assert manager.weather_data is not shown
+    assert manager.weather_data["temp"] == shown["temp"]
+    assert manager.failures == 1
+    assert manager.next_attempt > time.time()
+
+
+def test_forecasts_survive_a_restart(manager):
+    manager.fetch_weather()
+    restarted = WeatherManager(manager.settings_mgr)
+    assert set(restarted.forecasts) == set(manager.forecasts)
+    assert restarted.weather_data["city"] == "New York"
+    assert restarted.seconds_until_update() > 0
+
+
+def test_failed_fetch_publishes_under_data_lock(manager):
+    manager.fetch_weather()
+    manager.http.get_json = lambda *args, **kwargs: [_payload()]  # Wrong count
+
+    with manager.data_lock:
+        fetch = threading.Thread(target=manager.fetch_weather)
+        fetch.start()
+        fetch.join(0.2)
+        assert fetch.is_alive()  # Waits instead of racing a location switch
+        manager.selected_key = "52.52,13.41"
+        manager._refresh_current(time.time())
+    fetch.join()
+
+    assert manager.weather_data["city"] == "HQ"
+    assert manager.weather_data["location_key"] == manager.selected_key
+    assert manager.get_age() is not None
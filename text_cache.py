@@ -0,0 +1,72 @@
+"""LRU cache of rasterized text bitmaps"""
+
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+from config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Maps (text, font) to a pre-rasterized 1-bit bitmap so drawing is a blit"""
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of cached strings
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, font):
+        """
+        Get the rasterized text
+
+        Returns:
+            (bitmap, bbox) where bbox is the ink box relative to the draw
+            origin and bitmap is None for text without ink
+        """
+        key = (text, font)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = self._rasterize(text, font)
+        self.entries[key] = entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _rasterize(text, font):
+        """Render text once, cropped to its ink box"""
+        scratch = ImageDraw.Draw(Image.new("1", (1, 1)))
+        bbox = scratch.textbbox((0, 0), text, font=font)
+        width = bbox[2] - bbox[0]
+        height = bbox[3] - bbox[1]
+        if width <= 0 or height <= 0:
+            return None, bbox
+
+        bitmap = Image.new("1", (width, height))
+        ImageDraw.Draw(bitmap).text((-bbox[0], -bbox[1]), text, font=font, fill=255)
+        return bitmap, bbox
+
+    def clear(self):
+        """Drop all cached bitmaps"""
+        self.entries.clear()
+
+    def get_stats(self):
+        """Get hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
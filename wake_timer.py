@@ -1,58 +1,237 @@
 """Wake up timer functionality"""
 
 import json
+import os
+import threading
 import time
-from datetime import datetime
-from config import WAKE_FILE, WAKE_DURATION
+from datetime import datetime, timedelta
+from config import WAKE_FILE, WAKE_DURATION, WAKE_REARM_INTERVAL
+
+
+def parse_alarm_time(time_str):
+    """Parse "HH:MM" into (hour, minute), None if invalid"""
+    try:
+        parsed = datetime.strptime(time_str, "%H:%M")
+        return parsed.hour, parsed.minute
+    except (TypeError, ValueError):
+        return None
+
+
+def next_fire_time(alarm, now):
+    """
+    Next local time an alarm rings after `now`
+
+    Args:
+        alarm: {"time": "HH:MM", "days": [0-6] (Mon=0, empty = every day), "enabled": bool}
+        now: Naive local datetime
+
+    Returns:
+        Naive local datetime, or None if the alarm never rings
+    """
+    if not alarm.get("enabled", True):
+        return None
+    parsed = parse_alarm_time(alarm.get("time"))
+    if parsed is None:
+        return None
+
+    days = alarm.get("days") or range(7)
+    for offset in range(8):
+        day = now.date() + timedelta(days=offset)
+        if day.weekday() not in days:
+            continue
+        candidate = datetime(day.year, day.month, day.day, *parsed)
+        if candidate > now:
+            return candidate
+    return None
 
 
 class WakeTimer:
-    def __init__(self):
-        self.wake_time = None
+    """
+    Alarm clock driven by a precomputed next-fire time
+
+    Alarms live in the "alarms" setting. The earliest next occurrence is
+    converted to an epoch timestamp once; naive local datetimes go through
+    mktime, so DST changes are honoured. A single timer sleeps towards it,
+    re-armed at least every WAKE_REARM_INTERVAL so wall clock jumps (NTP
+    sync at boot) are noticed. Nothing is checked per frame.
+    """
+
+    def __init__(self, settings_mgr=None, on_fire=None):
+        """
+        Initialize wake timer
+
+        Args:
+            settings_mgr: SettingsManager holding the alarms (None = in memory only)
+            on_fire: Optional callback() run when an alarm starts ringing
+        """
+        self.settings_mgr = settings_mgr
+        self.on_fire = on_fire
+        self.alarms = []
         self.is_active = False
         self.end_time = 0
+
+        self.lock = threading.Lock()
+        self.timer = None
+        self.generation = 0  # Bumped on every re-arm, stale timers ignore themselves
+        self.next_fire = None  # Epoch seconds of the next alarm
+        self.running = False
+
         self.load()
-    
+        if settings_mgr:
+            settings_mgr.subscribe("alarms", lambda key, value: self._reload())
+            settings_mgr.subscribe("wake_time", self._on_wake_time_changed)
+
+    # ==============================
+    # Storage
+    # ==============================
+
     def load(self):
-        """Load wake time from file"""
+        """Load alarms from settings, importing the legacy wake file once"""
+        if self.settings_mgr:
+            self.alarms = list(self.settings_mgr.get("alarms") or [])
+        if not self.alarms:
+            legacy = self._load_legacy()
+            if legacy:
+                print(f"Imported wake time {legacy} from {WAKE_FILE}")
+                self._store([{"time": legacy, "days": [], "enabled": True}])
+
+    @staticmethod
+    def _load_legacy():
+        """Wake time from the old WAKE_FILE, None if absent"""
+        if not os.path.exists(WAKE_FILE):
+            return None
         try:
             with open(WAKE_FILE) as f:
-                data = json.load(f)
-                time_str = data.get("time", "")
-                self.wake_time = datetime.strptime(time_str, "%H:%M")
+                time_str = json.load(f).get("time", "")
+            return time_str if parse_alarm_time(time_str) else None
         except Exception as e:
             print(f"Error loading wake time: {e}")
-            self.wake_time = None
-    
+            return None
+
+    def reload_legacy(self, path=None):
+        """WAKE_FILE was edited by another tool: take its time as the first alarm"""
+        legacy = self._load_legacy()
+        if legacy and legacy != self.get_wake_time_str():
+            print(f"Wake time {legacy} picked up from {WAKE_FILE}")
+            self.save(legacy)
+
+    def _store(self, alarms):
+        """Replace the alarm list (persisted through settings) and re-arm"""
+        self.alarms = alarms
+        if self.settings_mgr:
+            # The first alarm is the one shown and edited on the device
+            self.settings_mgr.update({"alarms": alarms, "wake_time": alarms[0]["time"]} if alarms
+                                     else {"alarms": alarms})
+        self.arm()
+
+    def _reload(self):
+        """Alarms setting changed elsewhere"""
+        self.alarms = list(self.settings_mgr.get("alarms") or [])
+        self.arm()
+
+    def _on_wake_time_changed(self, key, value):
+        """Keep the first alarm in step with the wake_time setting"""
+        if self.alarms and parse_alarm_time(value) and self.alarms[0].get("time") != value:
+            self._store([dict(self.alarms[0], time=value)] + self.alarms[1:])
+
     def save(self, time_str):
-        """Save wake time to file"""
-        try:
-            with open(WAKE_FILE, "w") as f:
-                json.dump({"time": time_str}, f)
-            self.load()
-        except Exception as e:
-            print(f"Error saving wake time: {e}")
-    
+        """Set the first alarm's time (HH:MM), keeping its weekdays"""
+        if not parse_alarm_time(time_str):
+            print(f"Error saving wake time: invalid time {time_str!r}")
+            return
+        first = dict(self.alarms[0], time=time_str) if self.alarms else \
+            {"time": time_str, "days": [], "enabled": True}
+        self._store([first] + self.alarms[1:])
+
+    def set_alarms(self, alarms):
+        """
+        Replace all alarms
+
+        Args:
+            alarms: List of {"time": "HH:MM", "days": [0-6], "enabled": bool}
+        """
+        self._store([alarm for alarm in alarms if parse_alarm_time(alarm.get("time"))])
+
+    def get_alarms(self):
+        """Get the alarm list"""
+        return list(self.alarms)
+
     def get_wake_time_str(self):
         """Get wake time as formatted string"""
-        if self.wake_time:
-            return self.wake_time.strftime("%H:%M")
+        if self.alarms:
+            return self.alarms[0].get("time", "")
         return ""
-    
-    def check_alarm(self, current_time):
-        """Check if alarm should trigger"""
-        if self.wake_time and not self.is_active:
-            current_str = current_time.strftime("%H:%M")
-            wake_str = self.wake_time.strftime("%H:%M")
-            
-            if current_str == wake_str:
-                self.activate()
-    
+
+    # ==============================
+    # Scheduling
+    # ==============================
+
+    def get_next_fire(self, now=None):
+        """Earliest upcoming alarm as a naive local datetime, None if none"""
+        if now is None:
+            now = datetime.now()
+        times = [t for t in (next_fire_time(alarm, now) for alarm in self.alarms) if t]
+        return min(times) if times else None
+
+    def start(self):
+        """Start scheduling alarms"""
+        self.running = True
+        self.arm()
+
+    def stop(self):
+        """Stop the alarm timer"""
+        with self.lock:
+            self.running = False
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+
+    def arm(self):
+        """Compute the next fire time and (re)arm the timer"""
+        with self.lock:
+            if not self.running:
+                return
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            self.generation += 1
+
+            fire = self.get_next_fire()
+            self.next_fire = fire.timestamp() if fire else None
+            if self.next_fire is None:
+                return
+
+            delay = min(max(0.0, self.next_fire - time.time()), WAKE_REARM_INTERVAL)
+            self.timer = threading.Timer(delay, self._on_timer, args=(self.generation,))
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _on_timer(self, generation):
+        """Timer expired: ring if the alarm is due, otherwise sleep again"""
+        with self.lock:
+            if generation != self.generation:
+                return  # Re-armed meanwhile
+            self.timer = None
+            due = self.next_fire is not None and time.time() >= self.next_fire
+        if due:
+            self.activate()
+            if self.on_fire:
+                try:
+                    self.on_fire()
+                except Exception as e:
+                    print(f"Alarm callback error: {e}")
+        # Occurrences are strictly after now, so this moves on to the next one
+        self.arm()
+
+    # ==============================
+    # Ringing
+    # ==============================
+
     def activate(self):
         """Activate the alarm"""
         self.is_active = True
         self.end_time = time.time() + WAKE_DURATION
-    
+
     def update(self):
         """Update alarm state"""
         if self.is_active:
@@ -61,7 +240,7 @@ class WakeTimer:
                 self.is_active = False
             return remaining
         return None
-    
+
     def get_remaining_time(self):
         """Get remaining time for active alarm"""
         if self.is_active:
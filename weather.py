@@ -1,55 +1,408 @@
 """Weather data fetching and caching"""
 
-import requests
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from http_client import get_client, jittered
 from config import (
     WEATHER_API_URL,
     WEATHER_UPDATE_INTERVAL,
-    WEATHER_TIMEOUT
+    WEATHER_TIMEOUT,
+    WEATHER_FORECAST_DAYS,
+    WEATHER_INTERPOLATE_INTERVAL,
+    WEATHER_NEXT_HOURS,
+    WEATHER_CACHE_FILE,
+    WEATHER_CACHE_TTL,
+    WEATHER_BACKOFF_MIN,
+    WEATHER_BACKOFF_MAX,
+    LOCATION_CACHE_FILE,
+    DEFAULT_LATITUDE,
+    DEFAULT_LONGITUDE
 )
-from functools import lru_cache
+
+class Forecast:
+    """
+    Hourly and daily Open-Meteo forecast held in typed array columns
+
+    Timestamps are epoch seconds (timeformat=unixtime). Floats are stored
+    as array("f") with NaN for missing values, weather codes as array("b")
+    with -1, so two days of data stay a few kilobytes.
+    """
+
+    # Open-Meteo variable -> array typecode
+    HOURLY = {
+        "temperature_2m": "f",
+        "relative_humidity_2m": "f",
+        "wind_speed_10m": "f",
+        "precipitation": "f",
+        "weather_code": "b"
+    }
+    # Totals over the hour *ending* at each timestamp, not instant readings
+    PRECEDING_HOUR = {"precipitation"}
+    DAILY = {
+        "temperature_2m_max": "f",
+        "temperature_2m_min": "f",
+        "precipitation_sum": "f",
+        "weather_code": "b",
+        "sunrise": "q",
+        "sunset": "q"
+    }
+
+    def __init__(self, payload):
+        """
+        Build columns from a forecast response
+
+        Args:
+            payload: Decoded JSON with "hourly" and "daily" blocks
+
+        Raises:
+            KeyError, TypeError, ValueError: Malformed payload
+        """
+        hourly = payload["hourly"]
+        daily = payload["daily"]
+        self.hour_times = array("q", hourly["time"])
+        self.day_times = array("q", daily["time"])
+        self.hourly = {name: self._column(code, hourly[name]) for name, code in self.HOURLY.items()}
+        self.daily = {name: self._column(code, daily[name]) for name, code in self.DAILY.items()}
+
+    @staticmethod
+    def _column(typecode, values):
+        """Typed array with nulls mapped to NaN (floats) or -1 (integers)"""
+        missing = math.nan if typecode == "f" else -1
+        return array(typecode, (missing if value is None else value for value in values))
+
+    def covers(self, t):
+        """True if epoch time t lies within the hourly data"""
+        return bool(self.hour_times) and self.hour_times[0] <= t <= self.hour_times[-1]
+
+    def value_at(self, name, t):
+        """
+        Hourly variable at epoch time t
+
+        Instant readings are interpolated linearly between the surrounding
+        hours; weather codes hold the value of the hour that started last,
+        and PRECEDING_HOUR totals give the hour in progress.
+
+        Returns:
+            Value, or None outside the data or if missing
+        """
+        if not self.covers(t):
+            return None
+        column = self.hourly[name]
+        if name in self.PRECEDING_HOUR:
+            a = column[bisect_left(self.hour_times, t)]
+            return None if math.isnan(a) else a
+
+        i = min(bisect_right(self.hour_times, t) - 1, len(self.hour_times) - 1)
+        a = column[i]
+        if column.typecode != "f":
+            return None if a < 0 else a
+
+        if i + 1 < len(self.hour_times):
+            b = column[i + 1]
+            t0, t1 = self.hour_times[i], self.hour_times[i + 1]
+            if not math.isnan(a) and not math.isnan(b):
+                return a + (b - a) * (t - t0) / (t1 - t0)
+        return None if math.isnan(a) else a
+
+    def day_at(self, t):
+        """Daily values for the day containing epoch time t, None outside the data"""
+        i = bisect_right(self.day_times, t) - 1
+        if i < 0 or t >= self.day_times[i] + 86400:
+            return None
+        return {
+            name: (None if (math.isnan(column[i]) if column.typecode == "f" else column[i] < 0)
+                   else column[i])
+            for name, column in self.daily.items()
+        }
+
+    def hours_after(self, t, count):
+        """Indices of the next `count` whole hours after epoch time t"""
+        start = bisect_right(self.hour_times, t)
+        return range(start, min(start + count, len(self.hour_times)))
+
+
+# Forecast key of the auto-resolved location; configured sites use "lat,lon"
+LOCAL_KEY = "local"
 
 
 class WeatherManager:
-    def __init__(self):
-        location = self._get_location_from_ip()
+    """
+    Open-Meteo forecast with a disk cache
 
-        if location:
-            self.latitude = location["lat"]
-            self.longitude = location["lon"]
-            self.city = location["city"]
-        else:
-            self.latitude = 0
-            self.longitude = 0
-            self.city = "Unknown"
+    One request per WEATHER_UPDATE_INTERVAL fetches hourly and daily
+    forecast arrays; the values shown are interpolated from them locally
+    every WEATHER_INTERPOLATE_INTERVAL, so no request is needed between
+    fetches. The last good payload is kept on disk, so after a restart the
+    weather tab shows it immediately (marked stale once older than the TTL)
+    while a fresh fetch runs in the background. Failed fetches keep the old data on
+    screen and retry with jittered exponential backoff. All requests go
+    through the shared HttpClient (keep-alive, rate limits, circuit breaker).
+
+    Besides the auto-resolved local location, extra sites can be listed in
+    the "weather_locations" setting. All of them are fetched in a single
+    request (comma-separated coordinates), cached per location, and the
+    weather screen shows one at a time (next_location).
+    """
 
-        # Improve city accuracy using reverse geocoding
-        self.city = self._resolve_city_from_coords()
+    def __init__(self, settings_mgr=None):
+        """
+        Initialize weather manager
+
+        Args:
+            settings_mgr: SettingsManager with "weather_locations" (None = local only)
+        """
+        # Ready instantly: the location comes from the on-disk cache and is
+        # re-resolved in the background (start_location_resolver)
+        self.latitude = 0
+        self.longitude = 0
+        self.city = "Unknown"
+        self.locations = {}  # location key -> {"lat", "lon", "city", "resolved_at"}
+        self.location_key = None
+        self.location_known = False  # No fetch until a location is cached, resolved or defaulted
+        self.resolving = False
+        self.resolved_network = None  # (ssid, local ip) the location was resolved for
+        self.pending_network = None  # Network change seen while a resolve was running
+        self.location_lock = threading.Lock()
+        self.http = get_client()
+        self._load_locations()
+
+        # Configured sites, forecasts per location key, and the one on screen
+        self.settings_mgr = settings_mgr
+        self.sites = []  # [{"key", "name", "lat", "lon"}]
+        self.forecasts = {}  # location key -> {"forecast", "payload", "fetched_at", "lat", "lon", "name"}
+        self.selected_key = LOCAL_KEY
+        self.data_lock = threading.Lock()  # Guards selected_key and rebuilding weather_data
+        if settings_mgr:
+            self._load_sites()
+            settings_mgr.subscribe("weather_locations", self._on_sites_changed)
 
         self.last_update = None
-        self.weather_data = {
-            "city": self.city,
-            "temp": "N/A",
-            "condition": "N/A",
-            "humidity": "N/A",
-            "wind_speed": "N/A",
-            "updated": False
-        }
+        self.weather_data = self._placeholder(self.get_locations()[0])
+
+        # Fetch bookkeeping (wall clock, so it survives restarts via the cache)
+        self.fetched_at = None
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.wake = threading.Event()  # Set when a fetch should happen early
+
+        self._load_cache()
+
+    # ---------------- SITES ----------------
+
+    def _load_sites(self):
+        """Read the extra sites from the "weather_locations" setting"""
+        sites = []
+        keys = set()
+        for site in self.settings_mgr.get("weather_locations") or []:
+            try:
+                lat, lon = float(site["lat"]), float(site["lon"])
+            except (KeyError, TypeError, ValueError):
+                print(f"Ignoring weather location {site!r}: needs lat and lon")
+                continue
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                print(f"Ignoring weather location {site!r}: coordinates out of range")
+                continue
+            key = f"{lat:.2f},{lon:.2f}"
+            if key in keys:
+                # Same forecast key: the second site would show the first one's data
+                print(f"Ignoring weather location {site!r}: duplicates {key}")
+                continue
+            keys.add(key)
+            sites.append({"key": key, "name": str(site.get("name") or key), "lat": lat, "lon": lon})
+        self.sites = sites
+
+    def _on_sites_changed(self, key, value):
+        """Settings listener: let the weather thread fetch or redraw"""
+        self._load_sites()
+        self.wake.set()
+
+    @staticmethod
+    def _matches(entry, location):
+        """True if a forecast entry was fetched for the location's current place"""
+        return (entry is not None
+                and abs(entry["lat"] - location["lat"]) <= 0.1
+                and abs(entry["lon"] - location["lon"]) <= 0.1)
+
+    def _missing_forecasts(self):
+        """Locations without a forecast for where they are now"""
+        return [
+            location for location in self.get_locations()
+            if not self._matches(self.forecasts.get(location["key"]), location)
+        ]
+
+    def get_locations(self):
+        """All locations in display order, the local one first"""
+        local = {"key": LOCAL_KEY, "name": self.city, "lat": self.latitude, "lon": self.longitude}
+        return [local] + self.sites
+
+    def _selected_index(self, locations):
+        for index, location in enumerate(locations):
+            if location["key"] == self.selected_key:
+                return index
+        return 0
+
+    def next_location(self, step=1):
+        """
+        Show the next (or previous) location on the weather screen
+
+        Returns:
+            The new weather_data
+        """
+        locations = self.get_locations()
+        if len(locations) > 1:
+            with self.data_lock:
+                index = (self._selected_index(locations) + step) % len(locations)
+                self.selected_key = locations[index]["key"]
+            self.refresh_current()
+        return self.weather_data
 
     # ---------------- LOCATION ----------------
 
-    @lru_cache(maxsize=1)
+    def _load_locations(self):
+        """Start from the last resolved location on disk"""
+        try:
+            with open(LOCATION_CACHE_FILE, "r") as f:
+                cache = json.load(f)
+            self.locations = cache.get("locations", {})
+            entry = self.locations.get(cache.get("last_key"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Location cache error: {e}")
+            return
+
+        if entry:
+            self.location_key = cache["last_key"]
+            self.latitude = entry["lat"]
+            self.longitude = entry["lon"]
+            self.city = entry["city"]
+            self.location_known = True
+
+    def _save_locations(self):
+        """Atomically persist resolved locations"""
+        try:
+            os.makedirs(os.path.dirname(LOCATION_CACHE_FILE) or ".", exist_ok=True)
+            tmp_file = LOCATION_CACHE_FILE + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump({"last_key": self.location_key, "locations": self.locations}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, LOCATION_CACHE_FILE)
+        except Exception as e:
+            print(f"Error saving location cache: {e}")
+
+    @staticmethod
+    def _usable_ssid(ssid):
+        return ssid if ssid and ssid != "N/A" else None
+
+    def start_location_resolver(self, ssid=None, ip=None):
+        """
+        Resolve the location in the background if the network changed
+
+        Args:
+            ssid: Current WiFi network name (None or "N/A" if unknown)
+            ip: Local IP, identifies the network when there is no SSID
+        """
+        ssid = self._usable_ssid(ssid)
+        self._start_resolver((ssid, None if ssid else ip))
+
+    def _start_resolver(self, network):
+        """Resolve `network` now, or after the resolve already running"""
+        with self.location_lock:
+            if self.resolving:
+                self.pending_network = network  # Re-checked when the current resolve ends
+                return
+            if network == self.resolved_network:
+                return
+            self.resolving = True
+        threading.Thread(target=self._resolve_location, args=(network,), daemon=True).start()
+
+    def on_network_change(self, state):
+        """WiFi listener: re-resolve when the network changes"""
+        self.start_location_resolver(state.get("ssid"), state.get("ip"))
+
+    def _resolve_location(self, network):
+        """
+        Find the location for the current network, from cache when possible
+
+        Known SSIDs need no requests. Otherwise the public IP lookup runs
+        (it also gives the IP used as key off WiFi), and reverse geocoding
+        only happens for a key not seen before.
+        """
+        ssid = network[0]
+        try:
+            key = f"ssid:{ssid}" if ssid else None
+            entry = self.locations.get(key) if key else None
+
+            if entry is None:
+                location = self._get_location_from_ip()
+                if location is None:
+                    if not self.location_known:
+                        # Nothing cached either: fall back to the configured place
+                        print("Location unknown, using the default location")
+                        self._set_location({
+                            "lat": DEFAULT_LATITUDE,
+                            "lon": DEFAULT_LONGITUDE,
+                            "city": self.city
+                        })
+                    return  # Offline: keep the cached location, retry on next change
+                key = key or f"ip:{location['ip']}"
+                entry = self.locations.get(key)
+                if entry is None:
+                    entry = {
+                        "lat": location["lat"],
+                        "lon": location["lon"],
+                        "city": self._resolve_city_from_coords(
+                            location["lat"], location["lon"], location["city"]
+                        ),
+                        "resolved_at": time.time()
+                    }
+                    self.locations[key] = entry
+
+            self.resolved_network = network
+            if key != self.location_key:
+                self.location_key = key
+                self._save_locations()
+            self._set_location(entry)
+        finally:
+            with self.location_lock:
+                self.resolving = False
+                pending, self.pending_network = self.pending_network, None
+            if pending is not None and pending != network:
+                self._start_resolver(pending)
+
+    def _set_location(self, entry):
+        """Switch to a location, fetching fresh weather if it moved"""
+        moved = (abs(entry["lat"] - self.latitude) > 0.1
+                 or abs(entry["lon"] - self.longitude) > 0.1)
+        self.latitude = entry["lat"]
+        self.longitude = entry["lon"]
+        self.city = entry["city"]
+        if not self.location_known:
+            self.location_known = True
+            moved = True  # First known location: fetch now
+        if moved:
+            # The local forecast no longer matches, so a fetch is due at once
+            print(f"Location: {self.city} ({self.latitude}, {self.longitude})")
+            self.next_attempt = 0.0
+        # The weather thread fetches or redraws with the new name
+        self.wake.set()
+
     def _get_location_from_ip(self):
-        """Get real latitude/longitude from public IP"""
+        """Get real latitude/longitude (and the public IP) from the public IP"""
         try:
-            response = requests.get(
-                "https://ipapi.co/json/",
-                timeout=5
-            )
-            response.raise_for_status()
-            data = response.json()
+            data = self.http.get_json("https://ipapi.co/json/")
 
+            if data.get("latitude") is None or data.get("longitude") is None:
+                raise ValueError(data.get("reason") or "no coordinates in response")
             return {
+                "ip": data.get("ip"),
                 "lat": data.get("latitude"),
                 "lon": data.get("longitude"),
                 "city": data.get("city", "Unknown")
@@ -58,79 +411,315 @@ class WeatherManager:
             print(f"IP location error: {e}")
             return None
 
-    @lru_cache(maxsize=1)
-    def _resolve_city_from_coords(self):
+    def _resolve_city_from_coords(self, latitude, longitude, fallback):
         """Resolve city name from latitude/longitude"""
         try:
-            response = requests.get(
+            data = self.http.get_json(
                 "https://nominatim.openstreetmap.org/reverse",
                 params={
-                    "lat": self.latitude,
-                    "lon": self.longitude,
+                    "lat": latitude,
+                    "lon": longitude,
                     "format": "json"
-                },
-                headers={"User-Agent": "oled-weather"},
-                timeout=5
+                }
             )
-            response.raise_for_status()
-            address = response.json().get("address", {})
+            address = data.get("address", {})
             return (
                 address.get("city")
                 or address.get("town")
                 or address.get("village")
-                or self.city
+                or fallback
             )
         except Exception as e:
             print(f"City resolve error: {e}")
-            return self.city
+            return fallback
 
     # ---------------- WEATHER ----------------
 
     def fetch_weather(self):
-        """Fetch weather data from Open-Meteo API"""
+        """Fetch the hourly and daily forecast for every location in one Open-Meteo request"""
         try:
+            locations = self.get_locations()
             params = {
-                "latitude": self.latitude,
-                "longitude": self.longitude,
-                "current": (
-                    "temperature_2m,"
-                    "relative_humidity_2m,"
-                    "weather_code,"
-                    "wind_speed_10m"
-                ),
+                "latitude": ",".join(str(location["lat"]) for location in locations),
+                "longitude": ",".join(str(location["lon"]) for location in locations),
+                "hourly": ",".join(Forecast.HOURLY),
+                "daily": ",".join(Forecast.DAILY),
+                "timeformat": "unixtime",
+                "forecast_days": WEATHER_FORECAST_DAYS,
                 "timezone": "auto"
             }
 
-            response = requests.get(
+            data = self.http.get_json(
                 WEATHER_API_URL,
                 params=params,
                 timeout=WEATHER_TIMEOUT
             )
-            response.raise_for_status()
-
-            data = response.json()
-            current = data.get("current", {})
+            # A single location comes back as an object, several as a list in request order
+            payloads = data if isinstance(data, list) else [data]
+            if len(payloads) != len(locations):
+                raise ValueError(f"expected {len(locations)} forecasts, got {len(payloads)}")
 
-            weather_code = current.get("weather_code", 0)
-            condition = self._get_weather_condition(weather_code)
+            fetched_at = time.time()
+            forecasts = {
+                location["key"]: {
+                    "forecast": Forecast(payload),
+                    "payload": payload,
+                    "fetched_at": fetched_at,
+                    "lat": location["lat"],
+                    "lon": location["lon"],
+                    "name": location["name"]
+                }
+                for location, payload in zip(locations, payloads)
+            }
 
-            self.weather_data = {
-                "city": self.city,
-                "temp": round(current.get("temperature_2m", 0)),
-                "condition": condition,
-                "humidity": current.get("relative_humidity_2m", 0),
-                "wind_speed": round(current.get("wind_speed_10m", 0), 1),
-                "updated": True
+            # A location may have moved (or a site been removed) while the
+            # request was in flight: drop those forecasts, a refetch stays due
+            current = {location["key"]: location for location in self.get_locations()}
+            self.forecasts = {
+                key: entry for key, entry in forecasts.items()
+                if key in current and self._matches(entry, current[key])
             }
+            moved = len(self.forecasts) < len(forecasts)
+            if moved:
+                print("Locations changed during the weather fetch, fetching again")
+
+            self.fetched_at = None if moved else fetched_at
+            self.failures = 0
+            self.next_attempt = 0.0
+            self.refresh_current()
+            self._save_cache()
 
             self.last_update = datetime.now()
             return self.weather_data
 
         except Exception as e:
-            print(f"Weather fetch error: {e}")
-            self.weather_data["updated"] = False
+            # Keep showing the last good data, retry later with backoff
+            self.failures += 1
+            backoff = jittered(min(WEATHER_BACKOFF_MAX, WEATHER_BACKOFF_MIN * 2 ** (self.failures - 1)))
+            self.next_attempt = time.time() + backoff
+            # New dict: consumers detect changes by identity. Under the lock, so
+            # a location switched meanwhile is not overwritten with the old one
+            with self.data_lock:
+                self.weather_data = dict(
+                    self.weather_data, stale=self.is_stale(self.weather_data["location_key"])
+                )
+            print(f"Weather fetch error: {e} (retry in {int(backoff)}s)")
             return None
 
+    def refresh_current(self, now=None):
+        """
+        Rebuild weather_data for the selected location and the current time
+        from its forecast (no request)
+
+        Returns:
+            True if the forecast covers now and the values were updated
+        """
+        if now is None:
+            now = time.time()
+        with self.data_lock:
+            return self._refresh_current(now)
+
+    def _refresh_current(self, now):
+        """refresh_current with data_lock held (pass keys explicitly, the lock is not reentrant)"""
+        locations = self.get_locations()
+        index = self._selected_index(locations)
+        location = locations[index]
+        self.selected_key = location["key"]  # Falls back to local if the site was removed
+        entry = self.forecasts.get(location["key"])
+        if not self._matches(entry, location):
+            # No forecast, or one for a place this location no longer is
+            self.weather_data = self._placeholder(location, index, len(locations))
+            return False
+
+        forecast = entry["forecast"]
+        if not forecast.covers(now):
+            if self.weather_data.get("location_key") == location["key"] and self.weather_data["updated"]:
+                # Keep the last values, marked old (new dict: changes are detected by identity)
+                self.weather_data = dict(self.weather_data, stale=True)
+            else:
+                self.weather_data = self._placeholder(location, index, len(locations))
+            return False
+
+        temp = forecast.value_at("temperature_2m", now)
+        humidity = forecast.value_at("relative_humidity_2m", now)
+        wind = forecast.value_at("wind_speed_10m", now)
+        precipitation = forecast.value_at("precipitation", now)
+        day = forecast.day_at(now) or {}
+
+        self.weather_data = {
+            "city": location["name"],
+            "location_key": location["key"],
+            "location_index": index,
+            "location_count": len(locations),
+            "temp": "N/A" if temp is None else round(temp),
+            "condition": self._get_weather_condition(forecast.value_at("weather_code", now)),
+            "humidity": "N/A" if humidity is None else round(humidity),
+            "wind_speed": "N/A" if wind is None else round(wind, 1),
+            "precipitation": 0.0 if precipitation is None else round(precipitation, 1),
+            "high": None if day.get("temperature_2m_max") is None else round(day["temperature_2m_max"]),
+            "low": None if day.get("temperature_2m_min") is None else round(day["temperature_2m_min"]),
+            "sunrise": self._clock(day.get("sunrise")),
+            "sunset": self._clock(day.get("sunset")),
+            "next_hours": self.get_next_hours(WEATHER_NEXT_HOURS, now, location["key"]),
+            "updated": True,
+            "stale": self.is_stale(location["key"]),
+            "fetched_at": entry["fetched_at"]
+        }
+        return True
+
+    @staticmethod
+    def _placeholder(location, index=0, count=1):
+        """weather_data for a location without a usable forecast yet"""
+        return {
+            "city": location["name"],
+            "location_key": location["key"],
+            "location_index": index,
+            "location_count": count,
+            "temp": "N/A",
+            "condition": "N/A",
+            "humidity": "N/A",
+            "wind_speed": "N/A",
+            "updated": False,
+            "stale": False,
+            "fetched_at": None
+        }
+
+    def get_next_hours(self, count=6, now=None, key=None):
+        """
+        Forecast for the coming hours, from the stored arrays
+
+        Args:
+            count: Number of hours
+            now: Epoch seconds (default: current time)
+            key: Location key (default: the selected location)
+
+        Returns:
+            List of {"time", "hour", "temp", "condition", "precipitation"}
+        """
+        if key is None:
+            with self.data_lock:
+                key = self.selected_key
+        entry = self.forecasts.get(key)
+        if entry is None:
+            return []
+        if now is None:
+            now = time.time()
+        forecast = entry["forecast"]
+        hours = []
+        for i in forecast.hours_after(now, count):
+            t = forecast.hour_times[i]
+            temp = forecast.hourly["temperature_2m"][i]
+            # Total for the hour starting at t, stored at the hour's end
+            precipitation = forecast.value_at("precipitation", t + 1)
+            hours.append({
+                "time": t,
+                "hour": datetime.fromtimestamp(t).hour,
+                "temp": None if math.isnan(temp) else round(temp),
+                "condition": self._get_weather_condition(forecast.hourly["weather_code"][i]),
+                "precipitation": 0.0 if precipitation is None else round(precipitation, 1)
+            })
+        return hours
+
+    @staticmethod
+    def _clock(timestamp):
+        """Epoch seconds as local "HH:MM", None if missing"""
+        return datetime.fromtimestamp(timestamp).strftime("%H:%M") if timestamp else None
+
+    # ---------------- CACHE ----------------
+
+    def _load_cache(self):
+        """Serve the last good forecasts from disk, for locations still in use"""
+        try:
+            with open(WEATHER_CACHE_FILE, "r") as f:
+                cache = json.load(f)
+            entries = cache.get("locations")
+            if entries is None:
+                if "forecast" not in cache:
+                    return  # Written by a version that only stored current values
+                entries = {LOCAL_KEY: dict(cache, name=cache.get("city"))}  # Single-location format
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Weather cache error: {e}")
+            return
+
+        local = entries.get(LOCAL_KEY)
+        if local and not self.location_known:
+            # No resolved location on disk, the cached place is the best guess
+            self.latitude = local.get("latitude", 0)
+            self.longitude = local.get("longitude", 0)
+            self.city = local.get("name") or self.city
+            self.location_known = True
+
+        forecasts = {}
+        for location in self.get_locations():
+            cached = entries.get(location["key"])
+            if not cached:
+                continue
+            if (abs(cached.get("latitude", 0) - location["lat"]) > 0.1
+                    or abs(cached.get("longitude", 0) - location["lon"]) > 0.1):
+                continue  # Cached weather is for somewhere else
+            try:
+                forecasts[location["key"]] = {
+                    "forecast": Forecast(cached["forecast"]),
+                    "payload": cached["forecast"],
+                    "fetched_at": float(cached["fetched_at"]),
+                    "lat": location["lat"],
+                    "lon": location["lon"],
+                    "name": location["name"]
+                }
+            except Exception as e:
+                print(f"Weather cache error ({location['name']}): {e}")
+        if not forecasts:
+            return
+
+        self.forecasts = forecasts
+        if len(forecasts) == len(self.get_locations()):
+            # Refetch when the oldest entry expires; a missing site forces a fetch now
+            self.fetched_at = min(entry["fetched_at"] for entry in forecasts.values())
+        self.refresh_current()
+        print(f"Weather loaded from cache for {len(forecasts)} location(s)")
+
+    def _save_cache(self):
+        """Atomically write every location's forecast payload with its fetch time"""
+        cache = {
+            "locations": {
+                key: {
+                    "fetched_at": entry["fetched_at"],
+                    "latitude": entry["lat"],
+                    "longitude": entry["lon"],
+                    "name": entry["name"],
+                    "forecast": entry["payload"]
+                }
+                for key, entry in self.forecasts.items()
+            }
+        }
+        try:
+            os.makedirs(os.path.dirname(WEATHER_CACHE_FILE) or ".", exist_ok=True)
+            tmp_file = WEATHER_CACHE_FILE + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(cache, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, WEATHER_CACHE_FILE)
+        except Exception as e:
+            print(f"Error saving weather cache: {e}")
+
+    def get_age(self, key=None):
+        """Seconds since a location's data was fetched (default: selected), None if there is none"""
+        if key is None:
+            with self.data_lock:
+                key = self.selected_key
+        entry = self.forecasts.get(key)
+        if entry is None:
+            return None
+        return max(0.0, time.time() - entry["fetched_at"])
+
+    def is_stale(self, key=None):
+        """True if a location's data is older than WEATHER_CACHE_TTL"""
+        age = self.get_age(key)
+        return age is not None and age > WEATHER_CACHE_TTL
+
     # ---------------- UTILS ----------------
 
     def _get_weather_condition(self, code):
@@ -163,13 +752,26 @@ class WeatherManager:
         }
         return weather_codes.get(code, "Unknown")
 
+    def seconds_until_update(self):
+        """Seconds until the next fetch is due (backoff included), 0 if due now"""
+        if not self.location_known:
+            # Waiting for the resolver, which wakes the weather thread
+            return float(WEATHER_INTERPOLATE_INTERVAL)
+        now = time.time()
+        if self.fetched_at is None or self._missing_forecasts():
+            due = now  # New site or moved location
+        else:
+            due = self.fetched_at + WEATHER_UPDATE_INTERVAL
+        return max(0.0, max(due, self.next_attempt) - now)
+
     def should_update(self):
         """Check if weather data should be updated"""
-        if self.last_update is None:
-            return True
+        return self.seconds_until_update() == 0
 
-        elapsed = (datetime.now() - self.last_update).total_seconds()
-        return elapsed >= WEATHER_UPDATE_INTERVAL
+    def wait_until_due(self):
+        """Sleep until a fetch or a local refresh is due, or the location changes"""
+        self.wake.wait(max(1, min(self.seconds_until_update(), WEATHER_INTERPOLATE_INTERVAL)))
+        self.wake.clear()
 
     def get_display_string(self):
         """Get formatted weather string for display"""
@@ -1,20 +1,31 @@
 """HTTPS web server for wake timer configuration"""
 
+import json
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from ssl import SSLContext, PROTOCOL_TLS_SERVER
 from urllib.parse import parse_qs
 from config import WEB_SERVER_PORT, CERT_FILE, KEY_FILE
+from http_client import get_client
 
 
 class RequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for web server"""
     
-    # Reference to wake timer (set by WebServer)
+    # References set by WebServer
     wake_timer = None
+    display_mgr = None
     
     def do_GET(self):
         """Handle GET requests"""
+        if self.path == "/stats/latency":
+            self._send_json(self._latency_stats())
+            return
+        
+        if self.path == "/stats/http":
+            self._send_json(get_client().get_stats())
+            return
+        
         if self.path != "/":
             self.send_response(404)
             self.end_headers()
@@ -29,6 +40,21 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(page_bytes)
     
+    def _latency_stats(self):
+        """Encoder-to-display latency percentiles and histogram"""
+        if not self.display_mgr:
+            return {}
+        return self.display_mgr.latency.get_stats()
+    
+    def _send_json(self, data):
+        """Send a JSON response"""
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_POST(self):
         """Handle POST requests"""
         if self.path != "/set":
@@ -200,14 +226,16 @@ button:active {{
 class WebServer:
     """HTTPS web server"""
     
-    def __init__(self, wake_timer):
+    def __init__(self, wake_timer, display_mgr=None):
         self.wake_timer = wake_timer
+        self.display_mgr = display_mgr
         self.server = None
         self.thread = None
     
     def start(self):
         """Start the web server"""
         RequestHandler.wake_timer = self.wake_timer
+        RequestHandler.display_mgr = self.display_mgr
         
         self.server = HTTPServer(("0.0.0.0", WEB_SERVER_PORT), RequestHandler)
         
@@ -0,0 +1,186 @@
+"""Retained-mode widgets for the OLED screens"""
+
+from abc import ABC, abstractmethod
+from PIL import Image, ImageDraw
+from config import DISPLAY_WIDTH
+
+
+def boxes_overlap(a, b):
+    """Check if two inclusive (x0, y0, x1, y1) boxes intersect"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class Widget(ABC):
+    """
+    Base widget: a bound value and the box it occupied when last drawn
+
+    Args:
+        bind: Callable(data) returning the widget value, None for static widgets
+    """
+
+    def __init__(self, bind=None, value=None):
+        self.bind = bind
+        self.value = value
+        self.bbox = None   # Inclusive box drawn last time, None if nothing drawn
+        self.dirty = True
+
+    def update(self, data):
+        """Re-evaluate the binding, mark dirty if the value changed"""
+        if self.bind is None:
+            return
+        value = self.bind(data)
+        if value != self.value:
+            self.value = value
+            self.dirty = True
+
+    @property
+    def static(self):
+        """Static widgets are drawn once into the background layer"""
+        return self.bind is None
+
+    @abstractmethod
+    def draw(self, d, renderer):
+        """Rasterize the widget and return the box it covers (or None)"""
+
+    def draw_background(self, d, renderer):
+        """Draw the widget's static parts into a background layer"""
+        if self.static:
+            self.draw(d, renderer)
+
+
+class Label(Widget):
+    """Single line of text, left-aligned at x or centered"""
+
+    def __init__(self, y, x=0, text=None, centered=False, bind=None):
+        super().__init__(bind, text)
+        self.x = x
+        self.y = y
+        self.centered = centered
+
+    def draw(self, d, renderer):
+        text = "" if self.value is None else str(self.value)
+        if not text:
+            return None
+        if self.centered:
+            return renderer.draw_text_centered(d, text, self.y)
+        return renderer.draw_text(d, text, self.x, self.y)
+
+
+class ProgressBar(Widget):
+    """
+    Horizontal progress bar; bind returns (value, min, max) or None to hide
+
+    Args:
+        static_outline: Bar is always shown, so its border lives in the
+            background layer and only the fill is drawn per frame
+    """
+
+    def __init__(self, x, y, width, height, bind=None, static_outline=False):
+        super().__init__(bind)
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.static_outline = static_outline
+
+    def draw(self, d, renderer):
+        if self.value is None:
+            return None
+        value, min_val, max_val = self.value
+        renderer.draw_progress_bar(
+            d, value, min_val, max_val, self.x, self.y,
+            width=self.width, height=self.height, outline=not self.static_outline
+        )
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def draw_background(self, d, renderer):
+        if self.static_outline:
+            renderer.draw_progress_outline(d, self.x, self.y, self.width, self.height)
+
+
+class Divider(Widget):
+    """Full-width horizontal line"""
+
+    def __init__(self, y):
+        super().__init__()
+        self.y = y
+
+    def draw(self, d, renderer):
+        renderer.draw_divider(d, self.y)
+        return (0, self.y, DISPLAY_WIDTH - 1, self.y)
+
+
+class StatusBar(Widget):
+    """Top status bar; bind returns (signal_dbm, battery_percent, connected)"""
+
+    def draw(self, d, renderer):
+        if self.value is None:
+            return None
+        return renderer.draw_status_bar(d, *self.value)
+
+
+def render_background(widgets, renderer, size, mode="1"):
+    """Rasterize the static parts of a widget tree into a background layer"""
+    layer = Image.new(mode, size)
+    d = ImageDraw.Draw(layer)
+    for widget in widgets:
+        widget.draw_background(d, renderer)
+    return layer
+
+
+class Screen:
+    """
+    A tree of widgets rendered into a persistent 1-bit frame
+
+    The frame starts as a copy of the static background layer. Only dynamic
+    widgets whose bound value changed are re-rasterized: their old box is
+    restored from the background and widgets overlapping it are redrawn.
+    """
+
+    def __init__(self, widgets, background):
+        self.widgets = [w for w in widgets if not w.static]
+        self.damage = []
+        self.reset(background)
+
+    def reset(self, background):
+        """Start over from a (possibly re-rendered) background layer"""
+        self.background = background
+        self.image = background.copy()
+        self.draw = ImageDraw.Draw(self.image)
+        for widget in self.widgets:
+            widget.bbox = None
+            widget.dirty = True
+
+    def _restore(self, box):
+        """Copy the background back over an inclusive box"""
+        width, height = self.image.size
+        x0, y0 = max(0, box[0]), max(0, box[1])
+        x1, y1 = min(width, box[2] + 1), min(height, box[3] + 1)
+        if x0 < x1 and y0 < y1:
+            self.image.paste(self.background.crop((x0, y0, x1, y1)), (x0, y0))
+
+    def update(self, data, renderer):
+        """
+        Bring the persistent frame up to date
+
+        Returns:
+            Damage rectangles (inclusive boxes) changed by this update
+        """
+        for widget in self.widgets:
+            widget.update(data)
+
+        damage = [w.bbox for w in self.widgets if w.dirty and w.bbox]
+        for box in damage:
+            self._restore(box)
+
+        cleared = list(damage)
+        for widget in self.widgets:
+            overlapped = widget.bbox and any(boxes_overlap(widget.bbox, box) for box in cleared)
+            if widget.dirty or overlapped:
+                widget.bbox = widget.draw(self.draw, renderer)
+                widget.dirty = False
+                if widget.bbox:
+                    damage.append(widget.bbox)
+
+        self.damage = damage
+        return damage
@@ -1,30 +1,93 @@
 """WiFi and network management"""
 
+import array
+import errno
+import fcntl
+import re
+import socket
+import struct
 import subprocess
+import threading
 import time
-from config import WIFI_TIMEOUT, WIFI_CHECK_INTERVAL
+from config import (
+    WIFI_TIMEOUT,
+    WIFI_CHECK_INTERVAL,
+    WIFI_INTERFACE,
+    WIFI_SIGNAL_INTERVAL
+)
+from proc_reader import ProcFile
+
+# ioctl request numbers (linux/sockios.h, linux/wireless.h)
+SIOCGIFADDR = 0x8915
+SIOCGIWESSID = 0x8B1B
+
+IW_ESSID_MAX_SIZE = 32
+IWREQ_POINT_FORMAT = "16sPHH"  # ifr_name + struct iw_point
+IWREQ_SIZE = 32                # ifr_name + 16-byte union iwreq_data
+
+# rtnetlink multicast groups and message types (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+NLMSG_HEADER_FORMAT = "IHHII"  # len, type, flags, seq, pid
+NLMSG_HEADER_SIZE = struct.calcsize(NLMSG_HEADER_FORMAT)
+NETWORK_EVENTS = (RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR)
 
 
 class WiFiManager:
-    def __init__(self):
+    def __init__(self, interface=WIFI_INTERFACE):
         self.ap_started = False
         self.start_time = time.time()
         self.connected = False
+        self.interface = interface
+
+        # Kernel query handles are opened once and reused every frame
+        self.ioctl_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.wireless = ProcFile("/proc/net/wireless", size=512)
+        # "<iface>: status link level noise ..." -> signal level (dBm)
+        self.wireless_line = re.compile(
+            rb"^\s*" + re.escape(interface.encode()) + rb":\s+\S+\s+\S+\s+(-?[\d.]+)", re.M
+        )
+        self.essid_buf = array.array("B", bytes(IW_ESSID_MAX_SIZE + 1))
+
+        # Event-driven mode (see start_event_monitor)
+        self.monitoring = False
+        self.netlink_sock = None
+        self.state = None
+        self.state_lock = threading.Lock()
+        self.listeners = []
     
+    def _get_interface_ip(self, ifname):
+        """Get the IPv4 address of one interface via SIOCGIFADDR"""
+        req = struct.pack("256s", ifname.encode()[:15])
+        try:
+            result = fcntl.ioctl(self.ioctl_sock.fileno(), SIOCGIFADDR, req)
+        except OSError:
+            return None  # Interface has no IPv4 address
+        return socket.inet_ntoa(result[20:24])
+
     def get_ip(self):
-        """Get the current IP address"""
+        """Get the current IP address (first non-loopback IPv4, like hostname -I)"""
         try:
-            result = subprocess.check_output(
-                "hostname -I | awk '{print $1}'",
-                shell=True
-            ).decode().strip()
-            return result if result else None
+            for _, ifname in socket.if_nameindex():
+                if ifname == "lo":
+                    continue
+                ip = self._get_interface_ip(ifname)
+                if ip:
+                    return ip
+            return None
         except Exception as e:
             print(f"Error getting IP: {e}")
             return None
     
     def is_connected(self):
         """Check if WiFi is connected"""
+        if self.monitoring:
+            self.connected = self.state["connected"]
+            return self.connected
         ip = self.get_ip()
         self.connected = bool(ip)
         return self.connected
@@ -66,30 +129,158 @@ class WiFiManager:
     def get_signal_strength(self):
         """Get WiFi signal strength in dBm (-30 to -90, higher is better)"""
         try:
-            result = subprocess.check_output(
-                "iwconfig wlan0 2>/dev/null | grep 'Signal level' | awk -F'=' '{print $3}' | awk '{print $1}'",
-                shell=True
-            ).decode().strip()
-            if result:
-                try:
-                    return int(result)
-                except:
-                    return None
-            return None
+            data = self.wireless.read()
+            match = self.wireless_line.search(data) if data else None
+            if not match:
+                return None
+            return int(float(match.group(1)))
         except:
             return None
     
     def get_wifi_name(self):
         """Get connected WiFi network name (SSID)"""
         try:
-            result = subprocess.check_output(
-                "iwconfig wlan0 2>/dev/null | grep 'ESSID' | awk -F'\"' '{print $2}'",
-                shell=True
-            ).decode().strip()
-            return result if result else "N/A"
+            addr, size = self.essid_buf.buffer_info()
+            req = struct.pack(
+                IWREQ_POINT_FORMAT, self.interface.encode()[:15], addr, size, 0
+            ).ljust(IWREQ_SIZE, b"\0")
+            result = fcntl.ioctl(self.ioctl_sock.fileno(), SIOCGIWESSID, req)
+            length = struct.unpack_from(IWREQ_POINT_FORMAT, result)[2]
+            ssid = self.essid_buf.tobytes()[:length].rstrip(b"\0")
+            return ssid.decode(errors="replace") if ssid else "N/A"
         except:
             return "N/A"
     
+    # ==============================
+    # Event-driven network state
+    # ==============================
+
+    def _query_network(self):
+        """IP and SSID fields of the snapshot, from direct kernel queries"""
+        ip = self.get_ip()
+        return {
+            "ip": ip,
+            "ip_status": ip or "AP MODE",
+            "connected": bool(ip),
+            "ssid": self.get_wifi_name(),
+        }
+
+    def _query_state(self, dbm):
+        """Build a network state snapshot from direct kernel queries"""
+        return dict(self._query_network(), dbm=dbm, updated_at=time.monotonic())
+
+    def get_snapshot(self):
+        """
+        Get the current network state
+
+        Returns the in-memory snapshot when the event monitor is running,
+        otherwise queries the kernel directly.
+        """
+        if self.monitoring:
+            return self.state
+        return self._query_state(self.get_signal_strength())
+
+    def add_listener(self, callback):
+        """
+        Register a network change callback:
+        callback(state)
+        """
+        self.listeners.append(callback)
+
+    def _publish_update(self, **changes):
+        """
+        Merge changed fields into the snapshot and notify listeners
+
+        The merge happens under the lock, so the netlink and signal threads
+        never publish a copy that drops the other's latest fields.
+        """
+        with self.state_lock:
+            old = self.state
+            state = dict(old or {}, **changes, updated_at=time.monotonic())
+            self.state = state
+        if old is None:
+            return
+        if any(old[k] != state[k] for k in ("ip", "ssid", "dbm")):
+            for callback in self.listeners:
+                try:
+                    callback(state)
+                except Exception as e:
+                    print(f"Network listener error: {e}")
+
+    def start_event_monitor(self):
+        """
+        Subscribe to rtnetlink link/address events and keep a state snapshot
+
+        Returns:
+            True if event mode started, False if netlink is unavailable
+            (callers then keep polling).
+        """
+        if self.monitoring:
+            return True
+
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        except (OSError, AttributeError) as e:
+            print(f"Netlink unavailable, falling back to polling: {e}")
+            return False
+
+        self.netlink_sock = sock
+        self.state = self._query_state(self.get_signal_strength())
+        self.monitoring = True
+
+        threading.Thread(target=self._netlink_loop, daemon=True).start()
+        threading.Thread(target=self._signal_loop, daemon=True).start()
+        print("Network event monitor started")
+        return True
+
+    def _netlink_loop(self):
+        """Re-query IP and SSID whenever the kernel reports a link/address change"""
+        while self.monitoring:
+            try:
+                data = self.netlink_sock.recv(65536)
+            except OSError as e:
+                if not self.monitoring:
+                    return
+                # Events were lost (ENOBUFS = socket buffer overrun), so the
+                # snapshot can no longer be trusted: rebuild all of it
+                if e.errno != errno.ENOBUFS:
+                    print(f"Netlink receive error: {e}")
+                    time.sleep(WIFI_CHECK_INTERVAL)
+                self._publish_update(**self._query_network(), dbm=self.get_signal_strength())
+                continue
+
+            if self._has_network_event(data):
+                self._publish_update(**self._query_network())
+
+    @staticmethod
+    def _has_network_event(data):
+        """Check a netlink datagram for link or address messages"""
+        offset = 0
+        while offset + NLMSG_HEADER_SIZE <= len(data):
+            length, msg_type, _, _, _ = struct.unpack_from(NLMSG_HEADER_FORMAT, data, offset)
+            if msg_type in NETWORK_EVENTS:
+                return True
+            if length < NLMSG_HEADER_SIZE:
+                break
+            offset += (length + 3) & ~3  # NLMSG_ALIGN
+        return False
+
+    def _signal_loop(self):
+        """Sample signal strength on a slow timer (netlink does not report it)"""
+        while self.monitoring:
+            time.sleep(WIFI_SIGNAL_INTERVAL)
+            dbm = self.get_signal_strength()
+            if dbm != self.state["dbm"]:
+                self._publish_update(dbm=dbm)
+
+    def stop_event_monitor(self):
+        """Stop event-driven mode"""
+        self.monitoring = False
+        if self.netlink_sock:
+            self.netlink_sock.close()
+            self.netlink_sock = None
+
     def signal_to_icon(self, dbm):
         """Convert dBm to signal strength icon"""
         if dbm is None: